@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import List, Optional, Sequence
+
+# Shared Arabic text helpers: a search-oriented normalizer (run once over
+# the corpus at ingest time, and over every query) and a parser for article
+# ordinals such as "المادة الحادية عشرة" → 11.
+
+TATWEEL = "\u0640"
+TASHKEEL = [
+    *range(0x0610, 0x061B),   # Quranic marks
+    *range(0x064B, 0x0660),   # harakat, tanween, shadda, sukun, …
+    0x0670,                   # superscript alef
+    *range(0x06D6, 0x06EE),   # Quranic annotation signs
+]
+INVISIBLE = [*range(0x200B, 0x2010), *range(0x202A, 0x202F), *range(0x2066, 0x206A), 0xFEFF]
+
+# Every fold maps one codepoint to at most one character. FOLD_TABLE is the
+# single source of truth; the lookup tables below are precompiled from it.
+FOLD_TABLE = {
+    **dict.fromkeys(TASHKEEL, ""), **dict.fromkeys(INVISIBLE, ""),
+    ord(TATWEEL): "",
+    **{ord(c): "ا" for c in "أإآٱ"},
+    ord("ى"): "ي", ord("ة"): "ه",
+    **{0x0660 + i: str(i) for i in range(10)},   # Arabic-Indic digits
+    **{0x06F0 + i: str(i) for i in range(10)},   # Extended (Persian) digits
+    ord("\t"): " ", 0x00A0: " ",
+}
+
+# str.translate with a dict does a hash lookup per character; an indexable
+# table covering the BMP is about 3x faster. Astral characters raise
+# IndexError, which translate treats as "leave unchanged".
+_TRANSLATE = [chr(i) for i in range(0x10000)]
+for _cp, _repl in FOLD_TABLE.items():
+    _TRANSLATE[_cp] = _repl
+
+# For large batches, one regex deletion pass plus one str.replace per folded
+# codepoint (each a C-level scan) beats any per-character mapping.
+_DELETE_RE = re.compile("[%s]" % "".join(chr(cp) for cp, r in FOLD_TABLE.items() if not r))
+_REPLACE = [(chr(cp), r) for cp, r in FOLD_TABLE.items() if r]
+
+SPACES_RE = re.compile("  +")
+BATCH_SEP = "\x1e"   # ASCII record separator; never produced by the scrapers
+BATCH_CHARS = 64 * 1024
+
+
+def normalize(text: str) -> str:
+    """Fold spelling variants so that search terms match regardless of
+    tashkeel, tatweel, alef/yaa/taa-marbuta forms or digit script."""
+    return SPACES_RE.sub(" ", text.translate(_TRANSLATE))
+
+
+def _fold_window(texts: Sequence[str]) -> List[str]:
+    joined = _DELETE_RE.sub("", BATCH_SEP.join(texts))
+    for src, dst in _REPLACE:
+        if src in joined:
+            joined = joined.replace(src, dst)
+    return SPACES_RE.sub(" ", joined).split(BATCH_SEP)
+
+
+def normalize_batch(texts: Sequence[str]) -> List[str]:
+    """normalize() over a whole list at once.
+
+    Texts are joined into windows of about BATCH_CHARS characters, each
+    folded with a handful of C-level passes and split again. Windows keep
+    the working strings cache-sized; one giant join is slower on big lists."""
+    if any(BATCH_SEP in t for t in texts):
+        return [normalize(t) for t in texts]
+    out: List[str] = []
+    start = size = 0
+    for i, text in enumerate(texts):
+        size += len(text)
+        if size >= BATCH_CHARS:
+            out += _fold_window(texts[start:i + 1])
+            start, size = i + 1, 0
+    if start < len(texts):
+        out += _fold_window(texts[start:])
+    return out
+
+
+def text_digest(normalized: str) -> str:
+    """Short stable fingerprint of an already normalized text."""
+    return hashlib.sha1(normalized.encode("utf8")).hexdigest()[:16]
+
+
+#  Article ordinals
+UNITS = {
+    "اول": 1, "اولي": 1, "حادي": 1, "حاديه": 1,
+    "ثاني": 2, "ثانيه": 2, "ثالث": 3, "ثالثه": 3, "رابع": 4, "رابعه": 4,
+    "خامس": 5, "خامسه": 5, "سادس": 6, "سادسه": 6, "سابع": 7, "سابعه": 7,
+    "ثامن": 8, "ثامنه": 8, "تاسع": 9, "تاسعه": 9, "عاشر": 10, "عاشره": 10,
+}
+TEEN = {"عشر", "عشره"}
+TENS = {
+    "عشرون": 20, "عشرين": 20, "ثلاثون": 30, "ثلاثين": 30,
+    "اربعون": 40, "اربعين": 40, "خمسون": 50, "خمسين": 50,
+    "ستون": 60, "ستين": 60, "سبعون": 70, "سبعين": 70,
+    "ثمانون": 80, "ثمانين": 80, "تسعون": 90, "تسعين": 90,
+    "مائه": 100, "مئه": 100,
+    "مائتان": 200, "مائتين": 200, "مئتان": 200, "مئتين": 200,
+}
+JOINERS = {"و", "بعد"}   # "الرابعة و السبعون بعد المائة"
+NUMBER_RE = re.compile(r"^\(?\s*(\d+)\s*\)?")
+ARTICLE_WORD = "الماده"
+
+
+def _ordinal_word(word: str) -> str:
+    if word.startswith("و") and len(word) > 3:
+        word = word[1:]
+    if word.startswith("ال"):
+        word = word[2:]
+    return word
+
+
+def article_number(header: str) -> Optional[int]:
+    """Ordinal of an article heading ("المادة الحادية عشرة: …" → 11), or None."""
+    rest = normalize(header).strip()
+    if not rest.startswith(ARTICLE_WORD):
+        return None
+    rest = rest[len(ARTICLE_WORD):].strip()
+    match = NUMBER_RE.match(rest)
+    if match:
+        return int(match.group(1))
+
+    total, seen = 0, False
+    for word in rest.split(":")[0].split():
+        w = _ordinal_word(word)
+        if seen and w in JOINERS:
+            continue
+        if w in UNITS:
+            total += UNITS[w]
+        elif w in TEEN and seen:
+            total += 10
+        elif w in TENS:
+            total += TENS[w]
+        elif seen:
+            break
+        else:
+            return None
+        seen = True
+    return total or None
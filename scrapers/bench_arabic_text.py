@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sys
+import time
+from typing import Callable, List
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from scrapers.arabic_text import normalize, normalize_batch
+from scrapers.corpus_reader import (
+    LAW_SOURCES, PROCEDURES_PATH, SERVICES_PATH,
+    iter_articles, iter_procedure_steps, iter_services, requirement_lines,
+)
+
+# Throughput of Arabic normalization over every text in the corpus: an
+# ad-hoc regex + replace chain per item (what consumers did before),
+# normalize() per item, and normalize_batch() over the whole list.
+
+_ADHOC_TASHKEEL = re.compile("[ؐ-ًؚ-ٰٟۖ-ۭ]")
+_ADHOC_SPACES = re.compile(r"[ \t ]+")
+
+
+def adhoc(text: str) -> str:
+    text = _ADHOC_TASHKEEL.sub("", text).replace("ـ", "")
+    for src in "أإآٱ":
+        text = text.replace(src, "ا")
+    text = text.replace("ى", "ي").replace("ة", "ه")
+    for i in range(10):
+        text = text.replace(chr(0x0660 + i), str(i)).replace(chr(0x06F0 + i), str(i))
+    return _ADHOC_SPACES.sub(" ", text)
+
+
+def corpus_texts() -> List[str]:
+    texts: List[str] = []
+    for source, path in LAW_SOURCES.items():
+        if os.path.exists(path):
+            for a in iter_articles(source, path):
+                texts += [a.heading, a.text]
+    if os.path.exists(SERVICES_PATH):
+        for s in iter_services(SERVICES_PATH):
+            texts += [s.name or "", s.description or "", *s.requirements]
+    if os.path.exists(PROCEDURES_PATH):
+        for step in iter_procedure_steps(PROCEDURES_PATH):
+            texts += [step.name or "", step.description or "", *requirement_lines(step.requirements)]
+    return texts
+
+
+def timed(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Benchmark Arabic text normalization")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--scale", type=int, default=1,
+                    help="replicate the corpus N times to simulate growth")
+    args = ap.parse_args()
+
+    texts = corpus_texts() * args.scale
+    if not texts:
+        sys.exit("✖ No scraped data found under data/")
+    mb = sum(len(t.encode("utf8")) for t in texts) / 1e6
+    assert normalize_batch(texts) == [normalize(t) for t in texts]
+
+    cases = {
+        "ad hoc replace chain": lambda: [adhoc(t) for t in texts],
+        "normalize per item":   lambda: [normalize(t) for t in texts],
+        "normalize_batch":      lambda: normalize_batch(texts),
+    }
+    print(f"📚 {len(texts)} texts, {mb:.2f} MB (UTF-8)")
+    baseline = None
+    for name, fn in cases.items():
+        elapsed = timed(fn, args.repeat)
+        baseline = baseline or elapsed
+        print(f"   {name:<22}{elapsed * 1000:9.1f} ms {mb / elapsed:8.1f} MB/s"
+              f"  ({baseline / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
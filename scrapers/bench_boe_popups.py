@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import pathlib
+import sys
+import time
+from typing import Callable
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from bs4 import Tag
+
+from scrapers.html_parsing import make_soup
+from scrapers.http_cache import CACHE_DIR
+from scrapers.scrape_and_save import build_structure, index_popups
+
+# Before/after timing of amendment-popup linking on the largest BOE law in
+# the HTTP cache: the old per-article root.find() scan versus the one-pass
+# popup index used by build_structure.
+
+
+class ScanLookup:
+    """The previous behaviour: one full-tree search per article."""
+
+    def __init__(self, root: Tag) -> None:
+        self.root = root
+
+    def get(self, aid: str) -> Tag | None:
+        return self.root.find("div", class_=f"{aid} popup-list")
+
+
+def largest_boe_page(cache_dir: pathlib.Path) -> tuple[str, str] | None:
+    best = None
+    for meta_path in cache_dir.glob("*/*.json"):
+        meta = json.loads(meta_path.read_text("utf8"))
+        if "laws.boe.gov.sa" not in meta.get("url", ""):
+            continue
+        if best is None or meta.get("size", 0) > best[0].get("size", 0):
+            best = (meta, meta_path)
+    if best is None:
+        return None
+    meta, meta_path = best
+    body = meta_path.with_suffix(".body").read_bytes()
+    return meta["url"], body.decode(meta.get("encoding") or "utf8", errors="replace")
+
+
+def timed(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Benchmark BOE amendment linking")
+    ap.add_argument("--cache-dir", default=str(CACHE_DIR))
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    page = largest_boe_page(pathlib.Path(args.cache_dir))
+    if page is None:
+        sys.exit(f"✖ No BOE pages under {args.cache_dir} – run scrape_and_save.py first")
+
+    url, html = page
+    soup = make_soup(html)
+    root = soup.find(id="divLawText") or soup
+
+    before = timed(lambda: build_structure(root, ScanLookup(root)), args.repeat)
+    after  = timed(lambda: build_structure(root), args.repeat)
+    assert build_structure(root, ScanLookup(root)) == build_structure(root)
+
+    n_articles = len(root.find_all("div", class_="article_item"))
+    print(f"📖 {url}")
+    print(f"   {n_articles} articles, {len(index_popups(root))} amendment popups")
+    print(f"   per-article scan : {before * 1000:9.1f} ms")
+    print(f"   popup index      : {after * 1000:9.1f} ms  ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, Optional
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from scrapers.corpus_reader import LAW_SOURCES, law_articles, make_law
+from scrapers.corpus_pack import PACK_PATH, CorpusPack
+
+# Load time and memory of reading one law (or one article) from the current
+# pretty-printed JSON outputs versus the binary pack. Each case runs in a
+# fresh interpreter so the RSS figures are not polluted by the other cases.
+# The pack figures depend on its codec (msgpack when it was installed at
+# pack time, JSON otherwise), which is printed with the results.
+
+
+def rss_kb() -> Optional[int]:
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss // 1024
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def json_law(source: str, law_id: str, position: int, pack_path: str) -> Any:
+    # the current way: load the whole output file, then scan it
+    with open(LAW_SOURCES[source], "r", encoding="utf-8") as f:
+        data = json.load(f)
+    for raw in data.get("laws", []) if isinstance(data, dict) else data:
+        law = make_law(source, raw)
+        if law.law_id == law_id:
+            return law
+
+
+def json_article(source: str, law_id: str, position: int, pack_path: str) -> Any:
+    law = json_law(source, law_id, position, pack_path)
+    for article in law_articles(law):
+        if article.position == position:
+            return article
+
+
+def pack_law(source: str, law_id: str, position: int, pack_path: str) -> Any:
+    with CorpusPack(pack_path) as pack:
+        return pack.law(law_id, source)
+
+
+def pack_article(source: str, law_id: str, position: int, pack_path: str) -> Any:
+    with CorpusPack(pack_path) as pack:
+        return pack.article(law_id, position, source)
+
+
+CASES: Dict[str, Callable[[str, str, int, str], Any]] = {
+    "json: one law":     json_law,
+    "pack: one law":     pack_law,
+    "json: one article": json_article,
+    "pack: one article": pack_article,
+}
+
+
+def run_case(name: str, source: str, law_id: str, position: int, pack_path: str) -> None:
+    before = rss_kb()
+    start = time.perf_counter()
+    result = CASES[name](source, law_id, position, pack_path)
+    elapsed = time.perf_counter() - start
+    after = rss_kb()
+    print(json.dumps({
+        "ms": elapsed * 1000,
+        "rss_kb": after - before if before is not None and after is not None else None,
+        "found": result is not None,
+    }))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Benchmark JSON outputs against the binary pack")
+    ap.add_argument("--case", help=argparse.SUPPRESS)
+    ap.add_argument("--law", nargs=3, metavar=("SOURCE", "LAW_ID", "POS"), help=argparse.SUPPRESS)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--pack", default=str(PACK_PATH), help="pack written by corpus_pack.py --out")
+    args = ap.parse_args()
+
+    if args.case:
+        source, law_id, position = args.law
+        run_case(args.case, source, law_id, int(position), args.pack)
+        return
+
+    if not os.path.exists(args.pack):
+        sys.exit(f"✖ {args.pack} not found – run corpus_pack.py first")
+
+    # the law with the most articles is the worst case for the JSON path
+    with CorpusPack(args.pack) as pack:
+        source, law_id, name = max(pack.laws(), key=lambda l: pack.article_count(l[1], l[0]))
+        position = pack.article_count(law_id, source)
+        codec = pack.codec.name.decode()
+
+    print(f"📖 {source}: {name} (article {position})")
+    print(f"📦 {args.pack} ({codec} codec)")
+    print(f"   {'case':<20}{'ms':>10}{'RSS Δ MB':>10}")
+    for case in CASES:
+        runs = []
+        for _ in range(args.repeat):
+            out = subprocess.run(
+                [sys.executable, __file__, "--case", case, "--law", source, law_id, str(position),
+                 "--pack", args.pack],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            runs.append(json.loads(out))
+        best = min(runs, key=lambda r: r["ms"])
+        rss = f"{best['rss_kb'] / 1024:.1f}" if best["rss_kb"] is not None else "n/a"
+        print(f"   {case:<20}{best['ms']:>10.2f}{rss:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import pathlib
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Tuple
+from urllib.parse import urlsplit
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from scrapers import html_parsing
+from scrapers.http_cache import CACHE_DIR
+
+# Micro-benchmark of the HTML parsing layer on the pages saved in the HTTP
+# cache: every page is run through its scraper's extractor once per tree
+# builder and the per-scraper totals are compared against html.parser.
+# The extracted records are compared too; a backend is only safe to enable
+# (SCRAPER_HTML_PARSER) for scrapers whose "diff" column is 0.
+
+BACKENDS = ["html.parser", "lxml"]
+
+
+def boe(html: str, url: str) -> Any:
+    from scrapers.scrape_and_save import build_structure, extract_metadata
+
+    soup = html_parsing.make_soup(html)
+    return extract_metadata(soup), build_structure(soup.find(id="divLawText") or soup)
+
+
+def mc(html: str, url: str) -> Any:
+    from scrapers.mc.scrape_mc_laws import parse_law_page
+
+    return parse_law_page(html, url)
+
+
+def moj(html: str, url: str) -> Any:
+    from scrapers.scrape_moj_laws import parse_page
+
+    return parse_page(html, url)
+
+
+def business(html: str, url: str) -> Any:
+    from scrapers.business_sa.scraper_Procedures import parse_journey, parse_step
+    from scrapers.business_sa.scraper_services import parse_service
+
+    if "/servicesprocedures/" in url:
+        return parse_service(url, html)
+    if "/guidelines/journey" in url:
+        return parse_journey(html)
+    return parse_step(html)
+
+
+EXTRACTORS: Dict[str, Tuple[str, Callable[[str, str], Any]]] = {
+    "laws.boe.gov.sa": ("boe", boe),
+    "mc.gov.sa":       ("mc", mc),
+    "laws.moj.gov.sa": ("moj", moj),
+    "business.sa":     ("business.sa", business),
+}
+
+
+def saved_pages(cache_dir: pathlib.Path) -> Dict[str, List[Tuple[str, str]]]:
+    pages: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+    for meta_path in sorted(cache_dir.glob("*/*.json")):
+        meta = json.loads(meta_path.read_text("utf8"))
+        if "html" not in (meta.get("content_type") or "html"):
+            continue
+        host = urlsplit(meta["url"]).netloc
+        if host not in EXTRACTORS:
+            continue
+        body = meta_path.with_suffix(".body").read_bytes()
+        html = body.decode(meta.get("encoding") or "utf8", errors="replace")
+        pages[EXTRACTORS[host][0]].append((meta["url"], html))
+    return pages
+
+
+def outputs(pages: List[Tuple[str, str]], fn: Callable[[str, str], Any]) -> List[str]:
+    """Extractor output per page, serialized so that backends can be compared."""
+    return [json.dumps(fn(html, url), ensure_ascii=False, sort_keys=True, default=str)
+            for url, html in pages]
+
+
+def run(pages: List[Tuple[str, str]], fn: Callable[[str, str], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for url, html in pages:
+            fn(html, url)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Benchmark HTML parser backends")
+    ap.add_argument("--cache-dir", default=str(CACHE_DIR))
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    pages = saved_pages(pathlib.Path(args.cache_dir))
+    if not pages:
+        sys.exit(f"✖ No saved pages under {args.cache_dir} – run a scraper first")
+
+    fns = {name: fn for name, fn in EXTRACTORS.values()}
+    default = html_parsing.BACKEND
+    print(f"{'scraper':<12}{'pages':>6}" + "".join(f"{b:>14}" for b in BACKENDS)
+          + f"{'speedup':>10}{'diff':>6}")
+    mismatched = 0
+    for scraper, items in sorted(pages.items()):
+        timings, results = [], []
+        for backend in BACKENDS:
+            try:
+                html_parsing.make_soup("<p></p>", backend=backend)
+            except Exception:
+                timings.append(None)
+                results.append(None)
+                continue
+            html_parsing.set_backend(backend)
+            results.append(outputs(items, fns[scraper]))
+            timings.append(run(items, fns[scraper], args.repeat))
+        html_parsing.set_backend(default)
+
+        cells = "".join(f"{t * 1000:>12.1f}ms" if t else f"{'n/a':>14}" for t in timings)
+        base, fast = timings[0], timings[-1]
+        speedup = f"{base / fast:>9.2f}x" if base and fast else f"{'n/a':>10}"
+        if results[0] is not None and results[-1] is not None:
+            diff = sum(a != b for a, b in zip(results[0], results[-1]))
+            mismatched += diff
+            diff_cell = f"{diff:>6}"
+        else:
+            diff_cell = f"{'n/a':>6}"
+        print(f"{scraper:<12}{len(items):>6}{cells}{speedup}{diff_cell}")
+
+    if mismatched:
+        print(f"⚠️  {mismatched} pages extract differently under {BACKENDS[-1]} – "
+              f"keep SCRAPER_HTML_PARSER unset")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,151 +1,226 @@
-import requests
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
+from concurrent.futures import ThreadPoolExecutor
+import argparse
 import json
-import urllib3
-
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-with open("data\\Procedures_sources", "r", encoding="utf-8") as file:
-    lines = [line.strip() for line in file if line.strip()]
-
-categories = {}
-
-for line in lines:
+import os
+import sys
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from scrapers.html_parsing import Selector, make_soup
+from scrapers.business_sa.session import make_session
+from scrapers.http_cache import CACHE, cached_get
+
+SOURCES_PATH = os.path.join("data", "Procedures_sources")
+OUTPUT_PATH = os.path.join("data", "Procedures.json")
+WORKERS = 8
+
+# journey pages only need the sub-category heading and the step links
+JOURNEY_ONLY = SoupStrainer(["a", "h4"])
+BLOCK_LINK_SEL = Selector("a.block-link")
+STEP_SORT_SEL = Selector("span.step-sort")
+STEP_NAME_SEL = Selector("h4#stepName")
+DESCRIPTION_SEL = Selector("div.sub3-guidence-result-container.p-3")
+REQUIREMENTS_SEL = Selector("#pills-home")
+TERMS_SEL = Selector("#guidelines-terms")
+AUTHORITY_SEL = Selector("#pills-profile")
+AUTHORITY_LINK_SEL = Selector("a[href^='http']")
+INFO_LIST_SEL = Selector("div.sub3-guidence-result-container ul.CustomUL")
+ITEM_SEL = Selector("div.item")
+
+
+def load_sources(path=SOURCES_PATH):
+    with open(path, "r", encoding="utf-8") as file:
+        lines = [line.strip() for line in file if line.strip()]
+
+    sources = []
+    for line in lines:
+        try:
+            main_category, url = [part.strip() for part in line.split("|")]
+        except ValueError:
+            print(f"*Ignore an invalid line: {line}")
+            continue
+        sources.append((main_category, url))
+    return sources
+
+
+def parse_journey(html):
+    soup = make_soup(html, only=JOURNEY_ONLY)
+
+    h4_tag = soup.find("h4", class_="pt-1 h4-oneLine")
+    sub_category = h4_tag.get_text(strip=True) if h4_tag else "غير معروف"
+
+    links = []
+    for a_tag in BLOCK_LINK_SEL.select(soup):
+        href = a_tag.get('href')
+        if href and href.startswith("/guidelines/details?guidelineJourneyId="):
+            full_url = f"https://business.sa{href}"
+            links.append(full_url)
+    return sub_category, links
+
+
+def parse_step(html):
+    step_soup = make_soup(html)
+
+    step_number = STEP_SORT_SEL.select_one(step_soup)
+    step_name = STEP_NAME_SEL.select_one(step_soup)
+    step_number = step_number.get_text(strip=True) if step_number else ""
+    step_name = step_name.get_text(strip=True) if step_name else ""
+
+    desc_div = DESCRIPTION_SEL.select_one(step_soup)
+    description = desc_div.get_text(strip=True) if desc_div else ""
+
+    requirements_section = REQUIREMENTS_SEL.select_one(step_soup)
+    requirements = {}
+    if requirements_section:
+        container = TERMS_SEL.select_one(requirements_section)
+        if container:
+            children = list(container.children)
+            current_title = "General"
+            requirements[current_title] = []
+
+            for child in children:
+                if child.name is None:
+                    continue
+                if child.name in ["h4", "h5", "strong", "p"]:
+                    text = child.get_text(strip=True)
+                    if text:
+                        current_title = text
+                        if current_title not in requirements:
+                            requirements[current_title] = []
+                elif child.name == "ul":
+                    lis = child.find_all("li")
+                    items = [li.get_text(strip=True) for li in lis if li.get_text(strip=True)]
+                    requirements[current_title].extend(items)
+
+            if len(requirements) == 1 and "General" in requirements:
+                requirements = requirements["General"]
+
+    authority_links = []
+    authority_tab = AUTHORITY_SEL.select_one(step_soup)
+    if authority_tab:
+        links_auth = AUTHORITY_LINK_SEL.select(authority_tab)
+        for link in links_auth:
+            href = link.get('href')
+            if href and (".sa" in href):
+                if href not in authority_links:
+                    authority_links.append(href)
+    authority = authority_links if authority_links else []
+
+    additional_info_list = []
+    info_ul = INFO_LIST_SEL.select_one(step_soup)
+    if info_ul:
+        additional_info_list = [li.get_text(strip=True) for li in info_ul.find_all("li")]
+
+    duration = ""
+    cost = []
+    items = ITEM_SEL.select(step_soup)
+    for item in items:
+        title = item.find("h5")
+        content = item.find("div", class_="content")
+        if not title or not content:
+            continue
+        title_text = title.get_text(strip=True)
+        if title_text == "المدة الزمنية":
+            duration = content.get_text(strip=True)
+        elif title_text == "المقابل المالي":
+            lis = content.find_all("li")
+            if lis:
+                cost = [li.get_text(strip=True) for li in lis]
+            else:
+                cost = [content.get_text(strip=True)]
+
+    return {
+        "step_no": step_number,
+        "step_name": step_name,
+        "step_description": description,
+        "requirements": requirements,
+        "authority": authority,
+        "additional_info": additional_info_list,
+        "cost": cost,
+        "duration": duration,
+    }
+
+
+def fetch_journey(session, source):
+    main_category, url = source
+    print(f"----------Department processing-------------: {main_category} | {url}")
     try:
-        main_category, url = [part.strip() for part in line.split("|")]
-    except ValueError:
-        print(f"*Ignore an invalid line: {line}")
-        continue
+        response = cached_get(url, session)
+        return parse_journey(response.content)
+    except Exception as e:
+        print(f"*Error while processing{url}: {e}")
+        return None
 
-    print(f"----------Department processing-------------: {main_category} | {url}")
 
+def fetch_step(session, step_url):
+    print(f"*Processing the step: {step_url}")
     try:
-        response = requests.get(url, verify=False)
-        soup = BeautifulSoup(response.content, "html.parser")
-
-        h4_tag = soup.find("h4", class_="pt-1 h4-oneLine")
-        sub_category = h4_tag.get_text(strip=True) if h4_tag else "غير معروف"
-
-        links = []
-        for a_tag in soup.select('a.block-link'):
-            href = a_tag.get('href')
-            if href and href.startswith("/guidelines/details?guidelineJourneyId="):
-                full_url = f"https://business.sa{href}"
-                links.append(full_url)
-
-        all_steps = []
-
-        for step_url in links:
-            print(f"*Processing the step: {step_url}")
-            step_resp = requests.get(step_url, verify=False)
-            step_soup = BeautifulSoup(step_resp.text, "html.parser")
-
-            step_number = step_soup.select_one("span.step-sort")
-            step_name = step_soup.select_one("h4#stepName")
-            step_number = step_number.get_text(strip=True) if step_number else ""
-            step_name = step_name.get_text(strip=True) if step_name else ""
-
-            desc_div = step_soup.select_one("div.sub3-guidence-result-container.p-3")
-            description = desc_div.get_text(strip=True) if desc_div else ""
-
-            requirements_section = step_soup.select_one("#pills-home")
-            requirements = {}
-            if requirements_section:
-                container = requirements_section.select_one("#guidelines-terms")
-                if container:
-                    children = list(container.children)
-                    current_title = "General"
-                    requirements[current_title] = []
-
-                    for child in children:
-                        if child.name is None:
-                            continue
-                        if child.name in ["h4", "h5", "strong", "p"]:
-                            text = child.get_text(strip=True)
-                            if text:
-                                current_title = text
-                                if current_title not in requirements:
-                                    requirements[current_title] = []
-                        elif child.name == "ul":
-                            lis = child.find_all("li")
-                            items = [li.get_text(strip=True) for li in lis if li.get_text(strip=True)]
-                            requirements[current_title].extend(items)
-
-                    if len(requirements) == 1 and "General" in requirements:
-                        requirements = requirements["General"]
-
-            authority_links = []
-            authority_tab = step_soup.select_one("#pills-profile")
-            if authority_tab:
-                links_auth = authority_tab.select("a[href^='http']")
-                for link in links_auth:
-                    href = link.get('href')
-                    if href and (".sa" in href):
-                        if href not in authority_links:
-                            authority_links.append(href)
-            authority = authority_links if authority_links else []
-
-            additional_info_list = []
-            info_ul = step_soup.select_one("div.sub3-guidence-result-container ul.CustomUL")
-            if info_ul:
-                additional_info_list = [li.get_text(strip=True) for li in info_ul.find_all("li")]
-
-            duration = ""
-            cost = []
-            items = step_soup.select("div.item")
-            for item in items:
-                title = item.find("h5")
-                content = item.find("div", class_="content")
-                if not title or not content:
-                    continue
-                title_text = title.get_text(strip=True)
-                if title_text == "المدة الزمنية":
-                    duration = content.get_text(strip=True)
-                elif title_text == "المقابل المالي":
-                    lis = content.find_all("li")
-                    if lis:
-                        cost = [li.get_text(strip=True) for li in lis]
-                    else:
-                        cost = [content.get_text(strip=True)]
-
-            step_data = {
-                "step_no": step_number,
-                "step_name": step_name,
-                "step_description": description,
-                "requirements": requirements,
-                "authority": authority,
-                "additional_info": additional_info_list,
-                "cost": cost,
-                "duration": duration,
-            }
-
-            all_steps.append(step_data)
+        step_resp = cached_get(step_url, session)
+        return parse_step(step_resp.text)
+    except Exception as e:
+        print(f"*Error while processing the step {step_url}: {e}")
+        return None
+
+
+def scrape_procedures(sources, workers=WORKERS, session=None):
+    """
+    Fetch all journey pages, then every distinct step page once, on a
+    bounded worker pool, and assemble the Procedures.json structure.
+    """
+    session = session or make_session(workers)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        journeys = list(pool.map(lambda src: fetch_journey(session, src), sources))
+
+        # the same step page is linked from several journeys – fetch it once
+        step_urls = list(dict.fromkeys(
+            step_url for journey in journeys if journey for step_url in journey[1]
+        ))
+        steps = dict(zip(step_urls, pool.map(lambda u: fetch_step(session, u), step_urls)))
+
+    categories = {}
+    for (main_category, url), journey in zip(sources, journeys):
+        if journey is None:
+            continue
+        sub_category, links = journey
+        if any(steps[step_url] is None for step_url in links):
+            print(f"*Error while processing{url}: step page missing")
+            continue
 
         sub_item = {
             "type": sub_category,
             "url": url,
-            "Procedures": all_steps
+            "Procedures": [steps[step_url] for step_url in links]
         }
+        categories.setdefault(main_category, []).append(sub_item)
 
-        if main_category not in categories:
-            categories[main_category] = []
+    return {
+        "categories": [
+            {
+                "name": name,
+                "subcategories": subcats
+            } for name, subcats in categories.items()
+        ]
+    }
 
-        categories[main_category].append(sub_item)
 
-    except Exception as e:
-        print(f"*Error while processing{url}: {e}")
+def main():
+    parser = argparse.ArgumentParser(description="Scrape business.sa procedures")
+    parser.add_argument("--workers", type=int, default=WORKERS,
+                        help="pages fetched in parallel")
+    args = parser.parse_args()
+
+    final_json = scrape_procedures(load_sources(), args.workers)
 
-final_json = {
-    "categories": [
-        {
-            "name": name,
-            "subcategories": subcats
-        } for name, subcats in categories.items()
-    ]
-}
+    with open(OUTPUT_PATH, "w", encoding="utf-8") as out:
+        json.dump(final_json, out, ensure_ascii=False, indent=2)
 
-with open("data\\Procedures.json", "w", encoding="utf-8") as out:
-    json.dump(final_json, out, ensure_ascii=False, indent=2)
+    print("-----------The file has been created---------------: Procedures.json")
+    print(f"HTTP cache: {CACHE.summary()}")
 
-print("-----------The file has been created---------------: Procedures.json")
 
+if __name__ == "__main__":
+    main()
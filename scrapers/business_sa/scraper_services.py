@@ -1,54 +1,131 @@
-import requests
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
+from concurrent.futures import ThreadPoolExecutor
+import argparse
 import json
-import urllib3
+import os
+import sys
 
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
-with open("data\services_sources", "r", encoding="utf-8") as f:
-    urls = [line.strip() for line in f if line.strip()]
+from scrapers.html_parsing import compile_selector, make_soup
+from scrapers.business_sa.session import make_session
+from scrapers.http_cache import CACHE, cached_get
 
-services = []
+SOURCES_PATH = os.path.join("data", "services_sources")
+OUTPUT_PATH = os.path.join("data", "services.json")
+FAILURES_PATH = os.path.join("data", "services_failures.json")
+WORKERS = 8
+
+# every field lives under one of these ids – skip building the rest of the page
+SERVICE_ONLY = SoupStrainer(id=[
+    "service-title", "service-description", "service-terms",
+    "service-durations", "service-fees",
+])
+
+
+def load_urls(path=SOURCES_PATH):
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def failure(url, stage, error):
+    return {
+        "url": url,
+        "stage": stage,
+        "error": type(error).__name__,
+        "message": str(error),
+    }
 
-for url in urls:
-    print(f"Processing: {url}")
-    try:
-        response = requests.get(url, verify=False, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
-
-        def extract_text(selector):
-            tag = soup.select_one(selector)
-            return tag.get_text(strip=True) if tag else ""
-
-        def extract_list_items(selector):
-            ul = soup.select_one(selector)
-            return [li.get_text(strip=True) for li in ul.find_all("li")] if ul else []
-
-        def extract_fees(selector):
-            fees_div = soup.select_one(selector)
-            if not fees_div:
-                return []
-            li_elements = fees_div.find_all("li")
-            if li_elements:
-                return [li.get_text(strip=True) for li in li_elements]
-            text = fees_div.get_text(strip=True)
-            return [text] if text else []
-
-        service = {
-            "url": url,
-            "service_name": extract_text("#service-title"),
-            "description": extract_text("#service-description"),
-            "requirements": extract_list_items("#service-terms ul"),
-            "execution_duration": extract_text("#service-durations"),
-            "service_fee": extract_fees("#service-fees")
-        }
-
-        services.append(service)
 
+def fetch(session, url):
+    """Network stage: returns (content, None) or (None, failure record)."""
+    try:
+        response = cached_get(url, session, timeout=15)
+        response.raise_for_status()
+        return response.content, None
     except Exception as e:
-        print(f"فشل في {url}\n السبب: {e}")
+        return None, failure(url, "fetch", e)
+
+
+def parse_service(url, content):
+    soup = make_soup(content, only=SERVICE_ONLY)
+
+    def extract_text(selector):
+        tag = compile_selector(selector).select_one(soup)
+        return tag.get_text(strip=True) if tag else ""
+
+    def extract_list_items(selector):
+        ul = compile_selector(selector).select_one(soup)
+        return [li.get_text(strip=True) for li in ul.find_all("li")] if ul else []
+
+    def extract_fees(selector):
+        fees_div = compile_selector(selector).select_one(soup)
+        if not fees_div:
+            return []
+        li_elements = fees_div.find_all("li")
+        if li_elements:
+            return [li.get_text(strip=True) for li in li_elements]
+        text = fees_div.get_text(strip=True)
+        return [text] if text else []
+
+    return {
+        "url": url,
+        "service_name": extract_text("#service-title"),
+        "description": extract_text("#service-description"),
+        "requirements": extract_list_items("#service-terms ul"),
+        "execution_duration": extract_text("#service-durations"),
+        "service_fee": extract_fees("#service-fees")
+    }
+
+
+def scrape_services(urls, workers=WORKERS, session=None):
+    """
+    Download *urls* with *workers* threads sharing a keep-alive session and
+    parse each page on the calling thread as it arrives, in source order.
+    Returns (services, failures).
+    """
+    session = session or make_session(workers)
+    services, failures = [], []
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pages = pool.map(lambda url: fetch(session, url), urls)
+        for url, (content, error) in zip(urls, pages):
+            print(f"Processing: {url}")
+            if error:
+                failures.append(error)
+                continue
+            try:
+                services.append(parse_service(url, content))
+            except Exception as e:
+                failures.append(failure(url, "parse", e))
+
+    return services, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape business.sa services")
+    parser.add_argument("--workers", type=int, default=WORKERS,
+                        help="pages fetched in parallel")
+    args = parser.parse_args()
+
+    services, failures = scrape_services(load_urls(), args.workers)
+
+    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
+        json.dump({"services": services}, f, ensure_ascii=False, indent=2)
+
+    if failures:
+        with open(FAILURES_PATH, "w", encoding="utf-8") as f:
+            json.dump({"failures": failures}, f, ensure_ascii=False, indent=2)
+        print(f"\n {len(failures)} failures written to {FAILURES_PATH}")
+    elif os.path.exists(FAILURES_PATH):
+        # a clean run must not leave the previous run's failures behind
+        os.remove(FAILURES_PATH)
+
+    print("\n The data has been extracted and saved in services.json")
+    print(f" HTTP cache: {CACHE.summary()}")
 
-with open("data\services.json", "w", encoding="utf-8") as f:
-    json.dump({"services": services}, f, ensure_ascii=False, indent=2)
 
-print("\n The data has been extracted and saved in services.json")
+if __name__ == "__main__":
+    main()
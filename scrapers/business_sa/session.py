@@ -0,0 +1,18 @@
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+# HTTP session shared by the business.sa scrapers. The site's certificate
+# chain does not verify, so verification is off and the warning silenced.
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+
+def make_session(workers=8):
+    """One pooled session with a keep-alive connection per worker thread."""
+    session = requests.Session()
+    session.verify = False
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=workers)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
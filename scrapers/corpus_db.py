@@ -0,0 +1,375 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import pathlib
+import sqlite3
+import sys
+import time
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from scrapers.arabic_text import article_number, normalize, normalize_batch, text_digest
+from scrapers.corpus_reader import (
+    LAW_SOURCES, PROCEDURES_PATH, SERVICES_PATH, Law,
+    iter_laws, iter_procedure_steps, iter_services, requirement_lines,
+)
+
+# Ingestion stage that loads every scraped source into one SQLite database
+# with normalized tables and an FTS5 index, so lookups no longer need to
+# json.load and scan each multi-megabyte output file.
+
+DB_PATH = pathlib.Path("data/corpus.sqlite")
+BATCH_ROWS = 512   # services / procedure steps normalized per batch
+
+SCHEMA = """
+CREATE TABLE law (
+    id       INTEGER PRIMARY KEY,
+    source   TEXT NOT NULL,
+    law_id   TEXT NOT NULL,
+    name     TEXT,
+    url      TEXT,
+    metadata TEXT
+);
+CREATE TABLE part (
+    id       INTEGER PRIMARY KEY,
+    law      INTEGER NOT NULL REFERENCES law(id),
+    kind     TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    title    TEXT
+);
+CREATE TABLE chapter (
+    id       INTEGER PRIMARY KEY,
+    law      INTEGER NOT NULL REFERENCES law(id),
+    part     INTEGER REFERENCES part(id),
+    position INTEGER NOT NULL,
+    title    TEXT
+);
+CREATE TABLE article (
+    id       INTEGER PRIMARY KEY,
+    law      INTEGER NOT NULL REFERENCES law(id),
+    part     INTEGER REFERENCES part(id),
+    chapter  INTEGER REFERENCES chapter(id),
+    position INTEGER NOT NULL,
+    heading  TEXT,
+    number   INTEGER,
+    text     TEXT,
+    status   TEXT,
+    heading_norm TEXT,
+    text_norm    TEXT
+);
+CREATE TABLE service (
+    id                 INTEGER PRIMARY KEY,
+    url                TEXT,
+    name               TEXT,
+    description        TEXT,
+    requirements       TEXT,
+    execution_duration TEXT,
+    service_fee        TEXT,
+    name_norm          TEXT,
+    body_norm          TEXT
+);
+CREATE TABLE procedure_step (
+    id              INTEGER PRIMARY KEY,
+    category        TEXT,
+    subcategory     TEXT,
+    url             TEXT,
+    step_no         TEXT,
+    name            TEXT,
+    description     TEXT,
+    requirements    TEXT,
+    authority       TEXT,
+    additional_info TEXT,
+    cost            TEXT,
+    duration        TEXT,
+    name_norm       TEXT,
+    body_norm       TEXT
+);
+CREATE VIRTUAL TABLE search USING fts5(
+    kind UNINDEXED, ref UNINDEXED, title, body,
+    tokenize = "unicode61 remove_diacritics 2"
+);
+"""
+
+INDEXES = """
+CREATE INDEX law_by_id ON law(law_id, source);
+CREATE INDEX article_by_number ON article(law, number);
+CREATE INDEX article_by_position ON article(law, position);
+CREATE INDEX step_by_url ON procedure_step(url);
+"""
+
+
+#  Writers
+class _Ids:
+    def __init__(self) -> None:
+        self.article = 0
+        self.chapter = 0
+        self.part = 0
+        self.stale = 0   # dedup entries whose article text has changed
+
+
+def ingest_law(
+    db: sqlite3.Connection, ids: _Ids, law: Law,
+    duplicates: Optional[Mapping[Tuple[str, str, int], str]] = None,
+) -> int:
+    cur = db.execute(
+        "INSERT INTO law (source, law_id, name, url, metadata) VALUES (?,?,?,?,?)",
+        (law.source, law.law_id, law.name, law.url, _dump(law.metadata)),
+    )
+    law_row = cur.lastrowid
+    placed = []   # (part row, chapter row, article) in document order
+    chapter_pos = 0
+    for part_pos, part in enumerate(law.parts, 1):
+        ids.part += 1
+        part_row = ids.part
+        db.execute("INSERT INTO part VALUES (?,?,?,?,?)",
+                   (part_row, law_row, part["kind"], part_pos, part["title"]))
+        placed += [(part_row, None, a) for a in part["articles"]]
+        for ch in part["chapters"]:
+            ids.chapter += 1
+            chapter_pos += 1
+            db.execute("INSERT INTO chapter VALUES (?,?,?,?,?)",
+                       (ids.chapter, law_row, part_row, chapter_pos, ch["title"]))
+            placed += [(part_row, ids.chapter, a) for a in ch["articles"]]
+
+    # normalize the whole law in one batch, once, at ingest time
+    headings = normalize_batch([a["heading"] for _, _, a in placed])
+    texts = normalize_batch([a["text"] for _, _, a in placed])
+    rows, fts = [], []
+    for position, ((part_row, chapter_row, a), heading_norm, text_norm) in enumerate(
+        zip(placed, headings, texts), 1
+    ):
+        ids.article += 1
+        rows.append((ids.article, law_row, part_row, chapter_row, position, a["heading"],
+                     article_number(a["heading"]), a["text"], a["status"],
+                     heading_norm, text_norm))
+        expected = (duplicates or {}).get((law.source, law.law_id, position))
+        if expected and expected == text_digest(text_norm):
+            continue   # same text as a canonical copy indexed elsewhere
+        if expected:
+            ids.stale += 1
+        fts.append(("article", ids.article, heading_norm, text_norm))
+    db.executemany("INSERT INTO article VALUES (?,?,?,?,?,?,?,?,?,?,?)", rows)
+    db.executemany("INSERT INTO search VALUES (?,?,?,?)", fts)
+    return len(rows)
+
+
+def _dump(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _batches(items: Iterable[Any], size: int = BATCH_ROWS) -> Iterator[List[Any]]:
+    it = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def _normalized(batch: List[Any]) -> Tuple[List[str], List[str]]:
+    """Normalized (name, description + requirements) of services or steps."""
+    names = normalize_batch([item.name or "" for item in batch])
+    bodies = normalize_batch([" ".join([item.description or "",
+                                        *requirement_lines(item.requirements)])
+                              for item in batch])
+    return names, bodies
+
+
+def ingest_services(db: sqlite3.Connection, path: str) -> int:
+    count = 0
+    for batch in _batches(iter_services(path)):
+        for s, name_norm, body_norm in zip(batch, *_normalized(batch)):
+            cur = db.execute(
+                "INSERT INTO service (url, name, description, requirements, execution_duration, "
+                "service_fee, name_norm, body_norm) VALUES (?,?,?,?,?,?,?,?)",
+                (s.url, s.name, s.description, _dump(s.requirements), s.execution_duration,
+                 _dump(s.service_fee), name_norm, body_norm),
+            )
+            db.execute("INSERT INTO search VALUES (?,?,?,?)",
+                       ("service", cur.lastrowid, name_norm, body_norm))
+            count += 1
+    return count
+
+
+def ingest_procedures(db: sqlite3.Connection, path: str) -> int:
+    count = 0
+    for batch in _batches(iter_procedure_steps(path)):
+        for step, name_norm, body_norm in zip(batch, *_normalized(batch)):
+            cur = db.execute(
+                "INSERT INTO procedure_step (category, subcategory, url, step_no, name, "
+                "description, requirements, authority, additional_info, cost, duration, "
+                "name_norm, body_norm) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)",
+                (step.category, step.subcategory, step.url, step.step_no, step.name,
+                 step.description, _dump(step.requirements), _dump(step.authority),
+                 _dump(step.additional_info), _dump(step.cost), step.duration,
+                 name_norm, body_norm),
+            )
+            db.execute("INSERT INTO search VALUES (?,?,?,?)",
+                       ("procedure_step", cur.lastrowid, name_norm, body_norm))
+            count += 1
+    return count
+
+
+def build(
+    db_path: str | pathlib.Path = DB_PATH,
+    duplicates: Optional[Mapping[Tuple[str, str, int], str]] = None,
+) -> Dict[str, int]:
+    """(Re)build the corpus database from every source file that exists.
+    Articles listed in *duplicates* (see dedup.load_duplicates) are stored
+    but left out of the search index, so a text published several times is
+    only matched once. An entry is honoured only while the article's
+    normalized text still hashes to the recorded value; stale entries from
+    an older cluster map are indexed anyway and reported.
+
+    The database is written to a temporary file and swapped in at the end,
+    so readers never see a half-built corpus."""
+    db_path = pathlib.Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = db_path.with_suffix(db_path.suffix + ".tmp")
+    tmp.unlink(missing_ok=True)
+
+    db = sqlite3.connect(tmp)
+    db.execute("PRAGMA journal_mode = OFF")
+    db.execute("PRAGMA synchronous = OFF")
+    db.executescript(SCHEMA)
+
+    counts = {"laws": 0, "articles": 0, "services": 0, "procedure_steps": 0}
+    ids = _Ids()
+    with db:
+        for source, path in LAW_SOURCES.items():
+            if not os.path.exists(path):
+                print(f"⚠️  {source}: {path} not found, skipped")
+                continue
+            for law in iter_laws(source, path):
+                counts["articles"] += ingest_law(db, ids, law, duplicates)
+                counts["laws"] += 1
+        if os.path.exists(SERVICES_PATH):
+            counts["services"] = ingest_services(db, SERVICES_PATH)
+        if os.path.exists(PROCEDURES_PATH):
+            counts["procedure_steps"] = ingest_procedures(db, PROCEDURES_PATH)
+        if ids.stale:
+            print(f"⚠️  {ids.stale} dedup entries no longer match their article text, "
+                  "indexed anyway – re-run dedup.py")
+        db.executescript(INDEXES)
+        db.execute("INSERT INTO search(search) VALUES ('optimize')")
+    db.execute("ANALYZE")
+    db.close()
+
+    os.replace(tmp, db_path)
+    return counts
+
+
+#  Queries
+class CorpusDB:
+    def __init__(self, db_path: str | pathlib.Path = DB_PATH) -> None:
+        self.db = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True,
+                                  check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "CorpusDB":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def law(self, law_id: str, source: Optional[str] = None) -> Optional[sqlite3.Row]:
+        sql = "SELECT * FROM law WHERE law_id = ?"
+        args: list[Any] = [law_id]
+        if source:
+            sql += " AND source = ?"
+            args.append(source)
+        return self.db.execute(sql, args).fetchone()
+
+    def articles(self, law_id: str) -> List[sqlite3.Row]:
+        return self.db.execute(
+            "SELECT a.* FROM article a JOIN law l ON l.id = a.law "
+            "WHERE l.law_id = ? ORDER BY a.position", (law_id,)
+        ).fetchall()
+
+    def article(self, law_id: str, number: int, kind: str = "rules") -> Optional[sqlite3.Row]:
+        return self.db.execute(
+            "SELECT a.* FROM article a JOIN law l ON l.id = a.law "
+            "JOIN part p ON p.id = a.part "
+            "WHERE l.law_id = ? AND a.number = ? AND p.kind = ? "
+            "ORDER BY a.position LIMIT 1", (law_id, number, kind)
+        ).fetchone()
+
+    def search(self, query: str, limit: int = 10, kind: Optional[str] = None) -> List[sqlite3.Row]:
+        """Full-text search; the query is normalized the same way as the index.
+        Each term is quoted, so user input never reaches FTS5 query syntax."""
+        terms = " ".join(f'"{t}"' for t in normalize(query).replace('"', " ").split())
+        if not terms:
+            return []
+        sql = ("SELECT kind, ref, title, snippet(search, 3, '[', ']', '…', 12) AS snippet, "
+               "bm25(search) AS score FROM search WHERE search MATCH ?")
+        args: list[Any] = [terms]
+        if kind:
+            sql += " AND kind = ?"
+            args.append(kind)
+        sql += " ORDER BY score LIMIT ?"
+        args.append(limit)
+        return self.db.execute(sql, args).fetchall()
+
+
+def check(db_path: str | pathlib.Path = DB_PATH) -> bool:
+    """Search for one requirement item of a step whose requirements are
+    grouped by section, and confirm that the step is among the hits."""
+    with CorpusDB(db_path) as corpus:
+        for row in corpus.db.execute("SELECT id, requirements FROM procedure_step"):
+            requirements = json.loads(row["requirements"])
+            items = [i for items in requirements.values() for i in items] \
+                if isinstance(requirements, dict) else []
+            if items:
+                break
+        else:
+            print("⚠️  no procedure step with sectioned requirements to check")
+            return True
+        hits = corpus.search(items[-1], limit=1000, kind="procedure_step")
+        found = any(hit["ref"] == row["id"] for hit in hits)
+    print(f"{'✅' if found else '✖'} procedure_step {row['id']}: "
+          f"requirement {items[-1]!r} {'is' if found else 'is not'} searchable")
+    return found
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Build or query the SQLite corpus store")
+    ap.add_argument("--db", default=str(DB_PATH))
+    ap.add_argument("--search", metavar="QUERY", help="run a full-text query instead of building")
+    ap.add_argument("--limit", type=int, default=10)
+    ap.add_argument("--dedup", metavar="CLUSTERS",
+                    help="cluster map from dedup.py; non-canonical copies are not indexed")
+    ap.add_argument("--check", action="store_true",
+                    help="after building, verify that sectioned requirements are searchable")
+    args = ap.parse_args()
+
+    if args.search:
+        with CorpusDB(args.db) as corpus:
+            start = time.perf_counter()
+            rows = corpus.search(args.search, limit=args.limit)
+            elapsed = (time.perf_counter() - start) * 1000
+            for row in rows:
+                print(f"{row['kind']:<15}{row['ref']:>6}  {row['title'][:60]}")
+                print(f"{'':21}{row['snippet']}")
+            print(f"\n🔎 {len(rows)} results in {elapsed:.2f} ms")
+        return
+
+    start = time.perf_counter()
+    duplicates = None
+    if args.dedup:
+        from scrapers.dedup import load_duplicates
+        duplicates = load_duplicates(args.dedup)
+    counts = build(args.db, duplicates)
+    print(f"✅ Built {args.db} in {time.perf_counter() - start:.1f}s → "
+          + ", ".join(f"{k}: {v}" for k, v in counts.items()))
+    if args.check and not check(args.db):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
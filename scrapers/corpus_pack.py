@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import mmap
+import os
+import pathlib
+import struct
+import sys
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from scrapers.arabic_text import article_number
+from scrapers.corpus_reader import LAW_SOURCES, Law, iter_laws
+
+# Compact binary export of the law corpus. Every law outline and every
+# article is stored as its own record, and an index at the end of the file
+# maps (source, law_id) to record offsets, so a reader can mmap the file and
+# decode only the law or article it asks for instead of parsing 4+ MB of
+# pretty-printed JSON.
+#
+# Layout:  MAGIC | codec (8 bytes) | records … | index | index offset, length
+# Records are msgpack when it is installed, compact UTF-8 JSON otherwise.
+
+PACK_PATH = pathlib.Path("data/corpus.pack")
+MAGIC = b"SACORPK1"
+FOOTER = struct.Struct("<QQ")
+
+
+class _JsonCodec:
+    name = b"json"
+
+    @staticmethod
+    def dumps(value: Any) -> bytes:
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf8")
+
+    @staticmethod
+    def loads(data: bytes) -> Any:
+        return json.loads(data)
+
+
+class _MsgpackCodec:
+    name = b"msgpack"
+
+    @staticmethod
+    def dumps(value: Any) -> bytes:
+        import msgpack
+        return msgpack.packb(value, use_bin_type=True)
+
+    @staticmethod
+    def loads(data: bytes) -> Any:
+        import msgpack
+        return msgpack.unpackb(data, raw=False)
+
+
+CODECS = {c.name: c for c in (_JsonCodec, _MsgpackCodec)}
+
+
+def default_codec() -> type:
+    return _MsgpackCodec if importlib.util.find_spec("msgpack") else _JsonCodec
+
+
+#  Writer
+def _outline(law: Law) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Split a loaded law into its outline (articles replaced by their
+    1-based position) and the flat article list."""
+    articles: List[Dict[str, Any]] = []
+
+    def refs(items: List[Dict[str, Any]]) -> List[int]:
+        out = []
+        for a in items:
+            articles.append({**a, "number": article_number(a["heading"])})
+            out.append(len(articles))
+        return out
+
+    parts = []
+    for part in law.parts:
+        parts.append({
+            "kind": part["kind"],
+            "title": part["title"],
+            "articles": refs(part["articles"]),
+            "chapters": [{"title": ch["title"], "articles": refs(ch["articles"])}
+                         for ch in part["chapters"]],
+        })
+    outline = {"law_id": law.law_id, "name": law.name, "url": law.url,
+               "metadata": law.metadata}
+    outline["parts"] = parts
+    return outline, articles
+
+
+def write_pack(
+    laws: Iterable[Law],
+    path: str | pathlib.Path = PACK_PATH,
+    codec: Optional[type] = None,
+) -> int:
+    """Stream laws into a pack file; returns the law count."""
+    codec = codec or default_codec()
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+
+    index: List[list] = []
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + codec.name.ljust(8, b"\0"))
+
+        def put(value: Any) -> List[int]:
+            data = codec.dumps(value)
+            offset = f.tell()
+            f.write(data)
+            return [offset, len(data)]
+
+        for law in laws:
+            outline, articles = _outline(law)
+            law_ref = put(outline)
+            article_refs = [put(a) for a in articles]
+            index.append([law.source, law.law_id, law.name, *law_ref, article_refs])
+
+        index_ref = put({"laws": index})
+        f.write(FOOTER.pack(*index_ref))
+
+    os.replace(tmp, path)
+    return len(index)
+
+
+def build(path: str | pathlib.Path = PACK_PATH) -> int:
+    def all_laws() -> Iterator[Law]:
+        for source, src_path in LAW_SOURCES.items():
+            if os.path.exists(src_path):
+                yield from iter_laws(source, src_path)
+
+    return write_pack(all_laws(), path)
+
+
+#  Reader
+class CorpusPack:
+    """Read-only, lazily decoded view of a pack file."""
+
+    def __init__(self, path: str | pathlib.Path = PACK_PATH) -> None:
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:8] != MAGIC:
+            raise ValueError(f"{path} is not a corpus pack")
+        self.codec = CODECS[self._mm[8:16].rstrip(b"\0")]
+
+        offset, length = FOOTER.unpack(self._mm[-FOOTER.size:])
+        self._index: Dict[Tuple[str, str], list] = {}
+        self._by_id: Dict[str, list] = {}
+        for entry in self._decode(offset, length)["laws"]:
+            self._index[(entry[0], entry[1])] = entry
+            self._by_id.setdefault(entry[1], entry)
+
+    def close(self) -> None:
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> "CorpusPack":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _decode(self, offset: int, length: int) -> Any:
+        return self.codec.loads(self._mm[offset:offset + length])
+
+    def _entry(self, law_id: str, source: Optional[str]) -> list:
+        entry = self._index.get((source, law_id)) if source else self._by_id.get(law_id)
+        if entry is None:
+            raise KeyError(law_id)
+        return entry
+
+    def laws(self) -> Iterator[Tuple[str, str, str]]:
+        """(source, law_id, name) for every law, without decoding any record."""
+        for source, law_id, name, *_ in self._index.values():
+            yield source, law_id, name
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def article_count(self, law_id: str, source: Optional[str] = None) -> int:
+        return len(self._entry(law_id, source)[5])
+
+    def article(self, law_id: str, position: int, source: Optional[str] = None) -> Dict[str, Any]:
+        """Decode a single article by its 1-based position in the law."""
+        offset, length = self._entry(law_id, source)[5][position - 1]
+        return self._decode(offset, length)
+
+    def law(self, law_id: str, source: Optional[str] = None, articles: bool = True) -> Dict[str, Any]:
+        """Decode one law; with *articles*, article positions are replaced by
+        the decoded articles, giving the same shape as Law.parts."""
+        entry = self._entry(law_id, source)
+        law = self._decode(entry[3], entry[4])
+        if not articles:
+            return law
+        refs = entry[5]
+
+        def fill(positions: List[int]) -> List[Dict[str, Any]]:
+            return [self._decode(*refs[p - 1]) for p in positions]
+
+        for part in law["parts"]:
+            part["articles"] = fill(part["articles"])
+            for ch in part["chapters"]:
+                ch["articles"] = fill(ch["articles"])
+        return law
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Export the law corpus to the binary pack format")
+    ap.add_argument("--out", default=str(PACK_PATH))
+    args = ap.parse_args()
+
+    start = time.perf_counter()
+    count = build(args.out)
+    size = os.path.getsize(args.out)
+    print(f"✅ Packed {count} laws → {args.out} ({size / 1e6:.2f} MB, "
+          f"{default_codec().name.decode()}) in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
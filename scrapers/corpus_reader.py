@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import re
+from typing import IO, Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Union
+
+# Streaming readers for the scraper output files. Each file is walked one
+# element of its top-level array at a time (a law, a service, a procedure
+# category), so memory stays bounded by the largest single record rather
+# than by the size of the corpus. ijson is used when installed; otherwise a
+# small incremental reader built on json.JSONDecoder.raw_decode does the job.
+
+LAW_SOURCES = {
+    "boe":   "data/scraped_data/boe_laws_detailed.json",
+    "mc":    "data/scraped_data/mc_laws_detailed.json",
+    "moj":   "data/scraped_data/moj_laws_detailed.json",
+    "zatca": "data/zatca_data.json",
+}
+SERVICES_PATH   = "data/services.json"
+PROCEDURES_PATH = "data/Procedures.json"
+
+# key path from the document root to the array of records
+LAYOUTS: Dict[str, Sequence[str]] = {
+    "boe": (), "mc": (), "moj": (), "zatca": ("laws",),
+    "services": ("services",), "procedures": ("categories",),
+}
+
+# scraper_Procedures groups a step's requirements under the headings found
+# on the page; items before the first heading go under this placeholder
+GENERAL_SECTION = "General"
+
+BACKEND = "ijson" if importlib.util.find_spec("ijson") else "builtin"
+CHUNK_SIZE = 64 * 1024
+
+
+#  Records
+class Law(NamedTuple):
+    source: str
+    law_id: str
+    name: Optional[str]
+    url: Optional[str]
+    metadata: Dict[str, Any]
+    parts: List[Dict[str, Any]]   # [{kind, title, articles, chapters: [{title, articles}]}]
+
+
+class Article(NamedTuple):
+    source: str
+    law_id: str
+    position: int                 # 1-based, in document order across the law
+    part_kind: str
+    part_title: Optional[str]
+    chapter_title: Optional[str]
+    heading: str
+    text: str
+    status: Optional[str]
+
+
+class Service(NamedTuple):
+    url: Optional[str]
+    name: Optional[str]
+    description: Optional[str]
+    requirements: List[str]
+    execution_duration: Optional[str]
+    service_fee: List[str]
+
+
+class Category(NamedTuple):
+    name: Optional[str]
+    subcategories: List[Dict[str, Any]]
+
+
+Requirements = Union[List[str], Dict[str, List[str]]]
+
+
+class ProcedureStep(NamedTuple):
+    category: Optional[str]
+    subcategory: Optional[str]
+    url: Optional[str]
+    step_no: Optional[str]
+    name: Optional[str]
+    description: Optional[str]
+    requirements: Requirements    # flat list, or {section heading: items}
+    authority: List[str]
+    additional_info: List[str]
+    cost: List[str]
+    duration: Optional[str]
+
+
+#  Incremental JSON
+_WS = re.compile(r"\s*")
+_DECODER = json.JSONDecoder()
+
+
+class _Stream:
+    """Sliding window over a text file that decodes one JSON value at a time."""
+
+    def __init__(self, f: IO[str], chunk_size: int = CHUNK_SIZE) -> None:
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, at_least: int = 0) -> bool:
+        self.buf = self.buf[self.pos:]
+        self.pos = 0
+        data = self.f.read(max(self.chunk_size, at_least))
+        self.eof = not data
+        self.buf += data
+        return bool(data)
+
+    def peek(self) -> str:
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"expected {char!r}, found {found!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+                # a number touching the end of the window may be cut short
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # grow the window geometrically so large records decode in O(n)
+            self._fill(len(self.buf) - self.pos)
+
+
+def _builtin_items(f: IO[str], prefix: Sequence[str]) -> Iterator[Any]:
+    stream = _Stream(f)
+    for key in prefix:
+        stream.expect("{")
+        while True:
+            name = stream.value()
+            stream.expect(":")
+            if name == key:
+                break
+            stream.value()   # skip a sibling value
+            if stream.peek() != ",":
+                raise KeyError(key)
+            stream.pos += 1
+
+    stream.expect("[")
+    if stream.peek() == "]":
+        return
+    while True:
+        yield stream.value()
+        sep = stream.peek()
+        stream.pos += 1
+        if sep == "]":
+            return
+        if sep != ",":
+            raise ValueError(f"expected ',' or ']', found {sep!r}")
+
+
+def iter_items(path: str, prefix: Sequence[str] = ()) -> Iterator[Any]:
+    """Yield the elements of the array found at *prefix* one by one."""
+    if BACKEND == "ijson":
+        import ijson
+        with open(path, "rb") as f:
+            yield from ijson.items(f, ".".join([*prefix, "item"]), use_float=True)
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        yield from _builtin_items(f, prefix)
+
+
+#  Laws and articles
+def _article(heading: str, text: str, status: Optional[str] = None) -> Dict[str, Any]:
+    return {"heading": heading, "text": text, "status": status}
+
+
+def _scraped_article(a: Dict[str, Any]) -> Dict[str, Any]:
+    status = a.get("status") or ("canceled" if a.get("canceled") else None)
+    return _article(a.get("article_number", ""), a.get("text", ""), status)
+
+
+def _scraped_parts(parts: List[Dict[str, Any]], kind: str) -> Iterator[Dict[str, Any]]:
+    for part in parts:
+        yield {
+            "kind": kind,
+            "title": part.get("part_title"),
+            "chapters": [
+                {
+                    "title": ch.get("chapter_title"),
+                    "articles": [_scraped_article(a) for a in ch.get("articles", [])],
+                }
+                for ch in part.get("chapters", [])
+            ],
+            "articles": [_scraped_article(a) for a in part.get("articles", [])],
+        }
+
+
+def make_law(source: str, raw: Dict[str, Any]) -> Law:
+    """Map one raw law record of *source* onto the common Law shape."""
+    if source == "zatca":
+        return Law(
+            source=source,
+            law_id=raw.get("url"),
+            name=raw.get("name"),
+            url=raw.get("url"),
+            metadata=raw.get("metadata") or {},
+            parts=[{
+                "kind": "rules",
+                "title": None,
+                "chapters": [
+                    {
+                        "title": ch.get("chapter_title"),
+                        "articles": [
+                            _article(a.get("title", ""), a.get("content", ""))
+                            for a in ch.get("articles", [])
+                        ],
+                    }
+                    for ch in raw.get("chapters", [])
+                ],
+                "articles": [],
+            }],
+        )
+
+    return Law(
+        source=source,
+        law_id=raw["law_id"],
+        name=raw.get("name") or raw.get("title"),
+        url=raw.get("url"),
+        metadata=raw.get("metadata") or {},
+        parts=[
+            *_scraped_parts(raw.get("rules") or [], "rules"),
+            *_scraped_parts(raw.get("regulations") or [], "regulations"),
+        ],
+    )
+
+
+def iter_laws(source: str, path: Optional[str] = None) -> Iterator[Law]:
+    """Laws of one source (boe, mc, moj, zatca) in a common part/chapter shape."""
+    for raw in iter_items(path or LAW_SOURCES[source], LAYOUTS[source]):
+        yield make_law(source, raw)
+
+
+def law_articles(law: Law) -> Iterator[Article]:
+    position = 0
+    for part in law.parts:
+        groups = [(None, part["articles"])]
+        groups += [(ch["title"], ch["articles"]) for ch in part["chapters"]]
+        for chapter_title, articles in groups:
+            for a in articles:
+                position += 1
+                yield Article(law.source, law.law_id, position, part["kind"], part["title"],
+                              chapter_title, a["heading"], a["text"], a["status"])
+
+
+def iter_articles(source: str, path: Optional[str] = None) -> Iterator[Article]:
+    for law in iter_laws(source, path):
+        yield from law_articles(law)
+
+
+#  business.sa
+def iter_services(path: str = SERVICES_PATH) -> Iterator[Service]:
+    for s in iter_items(path, LAYOUTS["services"]):
+        yield Service(s.get("url"), s.get("service_name"), s.get("description"),
+                      s.get("requirements", []), s.get("execution_duration"),
+                      s.get("service_fee", []))
+
+
+def iter_categories(path: str = PROCEDURES_PATH) -> Iterator[Category]:
+    for c in iter_items(path, LAYOUTS["procedures"]):
+        yield Category(c.get("name"), c.get("subcategories", []))
+
+
+def requirement_lines(requirements: Requirements) -> List[str]:
+    """Requirements as plain strings: each section heading followed by its
+    items. The GENERAL_SECTION placeholder is not a heading from the page
+    and is left out."""
+    if not isinstance(requirements, dict):
+        return list(requirements)
+    lines: List[str] = []
+    for heading, items in requirements.items():
+        if heading != GENERAL_SECTION:
+            lines.append(heading)
+        lines += items
+    return lines
+
+
+def iter_procedure_steps(path: str = PROCEDURES_PATH) -> Iterator[ProcedureStep]:
+    """Steps of every procedure. ``requirements`` keeps the file's shape:
+    a list, or a dict of section heading → items for steps whose page
+    groups them; use requirement_lines() to flatten either form."""
+    for cat in iter_categories(path):
+        for sub in cat.subcategories:
+            for step in sub.get("Procedures", []):
+                yield ProcedureStep(
+                    cat.name, sub.get("type"), sub.get("url"), step.get("step_no"),
+                    step.get("step_name"), step.get("step_description"),
+                    step.get("requirements", []), step.get("authority", []),
+                    step.get("additional_info", []), step.get("cost", []),
+                    step.get("duration"),
+                )
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import pathlib
+import re
+import sys
+import time
+import zlib
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from scrapers.arabic_text import normalize, normalize_batch, text_digest
+from scrapers.corpus_reader import LAW_SOURCES, Article, Law, iter_laws, law_articles
+
+# Near-duplicate detection across sources. Normalized texts are split into
+# word shingles, MinHash signatures are computed for whole batches of
+# documents with NumPy, and LSH banding proposes candidate pairs that are
+# confirmed by their estimated Jaccard similarity. Runs once over articles
+# and once over whole laws, and writes a cluster map whose first member of
+# every cluster is the canonical copy: a non-canceled article of the most
+# recently issued law, ties broken by LAW_SOURCES order.
+#
+# Every cluster carries a scope: "law" (repeats inside one law, often a
+# scraper structure problem rather than a real duplicate), "source" (two
+# laws of one source) or "cross-source".
+
+CLUSTERS_PATH = pathlib.Path("data/dedup_clusters.json")
+
+SHINGLE_WORDS = 5
+NUM_PERM = 128
+BANDS = 16                      # 16 bands × 8 rows: candidates from J ≈ 0.7
+ROWS = NUM_PERM // BANDS
+THRESHOLD = 0.8                 # estimated Jaccard needed to join a cluster
+MIN_WORDS = 8                   # shorter texts ("ملغاة", headings) are skipped
+BATCH_SHINGLES = 1 << 15        # shingles hashed per NumPy batch
+
+_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.default_rng(0x5A)
+_A = _rng.integers(1, int(_PRIME), NUM_PERM, dtype=np.uint64)[:, None]
+_B = _rng.integers(0, int(_PRIME), NUM_PERM, dtype=np.uint64)[:, None]
+
+
+#  MinHash
+def shingles(text: str) -> np.ndarray:
+    """Distinct CRC32 hashes of the word k-shingles of a normalized text."""
+    words = text.split()
+    if len(words) < MIN_WORDS:
+        return np.empty(0, dtype=np.uint64)
+    grams = {" ".join(words[i:i + SHINGLE_WORDS])
+             for i in range(len(words) - SHINGLE_WORDS + 1)}
+    return np.fromiter((zlib.crc32(g.encode("utf8")) for g in grams),
+                       dtype=np.uint64, count=len(grams))
+
+
+def minhash(sets: Sequence[np.ndarray]) -> np.ndarray:
+    """(len(sets), NUM_PERM) signatures; every set must be non-empty.
+
+    Sets are concatenated and hashed in batches of about BATCH_SHINGLES, so
+    all permutations of a batch are one (NUM_PERM × n) array operation, and
+    np.minimum.reduceat takes the per-document minima."""
+    out = np.empty((len(sets), NUM_PERM), dtype=np.uint64)
+    start = 0
+    while start < len(sets):
+        stop, total = start, 0
+        while stop < len(sets) and (total == 0 or total + len(sets[stop]) <= BATCH_SHINGLES):
+            total += len(sets[stop])
+            stop += 1
+        batch = sets[start:stop]
+        hashes = np.concatenate(batch) % _PRIME
+        offsets = np.cumsum([0] + [len(s) for s in batch[:-1]])
+        permuted = (_A * hashes[None, :] + _B) % _PRIME
+        out[start:stop] = np.minimum.reduceat(permuted, offsets, axis=1).T
+        start = stop
+    return out
+
+
+#  LSH
+class _UnionFind:
+    def __init__(self, n: int) -> None:
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> None:
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            self.parent[max(ri, rj)] = min(ri, rj)
+
+
+def lsh_clusters(signatures: np.ndarray, threshold: float = THRESHOLD) -> List[List[int]]:
+    """Groups of row indices whose signatures agree on at least *threshold*
+    of their permutations. Each band is bucketed with one np.unique call,
+    and each bucket member is checked against the bucket's first member, so
+    the work stays linear in the number of documents."""
+    n = len(signatures)
+    uf = _UnionFind(n)
+    for band in range(BANDS):
+        rows = np.ascontiguousarray(signatures[:, band * ROWS:(band + 1) * ROWS])
+        keys = rows.view(np.dtype((np.void, rows.dtype.itemsize * ROWS))).ravel()
+        _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        shared = np.flatnonzero(counts[inverse] > 1)
+        if not len(shared):
+            continue
+        order = shared[np.argsort(inverse[shared], kind="stable")]
+        groups = np.split(order, np.flatnonzero(np.diff(inverse[order])) + 1)
+        for group in groups:
+            head = group[0]
+            agree = (signatures[group[1:]] == signatures[head]).mean(axis=1)
+            for member in group[1:][agree >= threshold]:
+                uf.union(int(head), int(member))
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(n):
+        clusters.setdefault(uf.find(i), []).append(i)
+    return [members for members in clusters.values() if len(members) > 1]
+
+
+#  Corpus
+CANCELED = {"canceled", "ملغاة", "لاغي"}
+ISSUE_KEYS = ("تاريخ الاصدار", "تاريخ الإصدار")
+YEAR_RE = re.compile(r"\b(1[34]\d\d)\b")   # Hijri year
+
+
+def issue_year(law: Law) -> int:
+    """Hijri issue year from the law metadata, or 0 when unknown."""
+    for key in ISSUE_KEYS:
+        match = YEAR_RE.search(normalize(str(law.metadata.get(key) or "")))
+        if match:
+            return int(match.group(1))
+    return 0
+
+
+def _scope(members: List[Dict[str, Any]]) -> str:
+    if len({m["source"] for m in members}) > 1:
+        return "cross-source"
+    if len({m["law_id"] for m in members}) > 1:
+        return "source"
+    return "law"
+
+
+def _cluster(refs: List[Dict[str, Any]], rank: List[tuple], members: List[int]) -> Dict[str, Any]:
+    ordered = sorted(members, key=lambda i: rank[i])
+    items = [refs[i] for i in ordered]
+    return {"scope": _scope(items), "members": items}
+
+
+def find_duplicates(threshold: float = THRESHOLD) -> Dict[str, Any]:
+    articles: List[Article] = []
+    years: List[int] = []
+    laws: List[Dict[str, Any]] = []
+    law_years: List[int] = []
+    law_texts: List[str] = []
+    for source, path in LAW_SOURCES.items():
+        if not os.path.exists(path):
+            continue
+        for law in iter_laws(source, path):
+            items = list(law_articles(law))
+            year = issue_year(law)
+            articles += items
+            years += [year] * len(items)
+            laws.append({"source": law.source, "law_id": law.law_id, "name": law.name})
+            law_years.append(year)
+            law_texts.append("\n".join(a.text for a in items))
+
+    norm_articles = normalize_batch([a.text for a in articles])
+    article_refs = [
+        {"source": a.source, "law_id": a.law_id, "position": a.position,
+         "heading": a.heading, "status": a.status, "hash": text_digest(norm)}
+        for a, norm in zip(articles, norm_articles)
+    ]
+    # canonical first: not canceled, newest law, then corpus order
+    article_rank = [(a.status in CANCELED, -year, i)
+                    for i, (a, year) in enumerate(zip(articles, years))]
+    law_rank = [(False, -year, i) for i, year in enumerate(law_years)]
+
+    result: Dict[str, Any] = {
+        "params": {"shingle_words": SHINGLE_WORDS, "num_perm": NUM_PERM, "bands": BANDS,
+                   "threshold": threshold, "min_words": MIN_WORDS},
+    }
+    for level, refs, rank, texts in (
+        ("articles", article_refs, article_rank, norm_articles),
+        ("laws", laws, law_rank, normalize_batch(law_texts)),
+    ):
+        sets = [shingles(t) for t in texts]
+        kept = [i for i, s in enumerate(sets) if len(s)]
+        signatures = minhash([sets[i] for i in kept])
+        result[level] = [
+            _cluster(refs, rank, [kept[i] for i in members])
+            for members in lsh_clusters(signatures, threshold)
+        ]
+        result[f"{level}_checked"] = len(kept)
+    return result
+
+
+def load_duplicates(path: str | pathlib.Path = CLUSTERS_PATH) -> Dict[Tuple[str, str, int], str]:
+    """Non-canonical articles of every cross-law cluster, mapped to the hash
+    of the normalized text they had when the map was built. Repeats inside
+    a single law are not returned: both copies are distinct articles."""
+    with open(path, "r", encoding="utf-8") as f:
+        clusters = json.load(f)["articles"]
+    return {
+        (m["source"], m["law_id"], m["position"]): m["hash"]
+        for c in clusters if c["scope"] != "law"
+        for m in c["members"][1:]
+    }
+
+
+def _summary(clusters: Iterable[Dict[str, Any]]) -> Dict[str, Tuple[int, int]]:
+    out: Dict[str, Tuple[int, int]] = {}
+    for c in clusters:
+        n, redundant = out.get(c["scope"], (0, 0))
+        out[c["scope"]] = (n + 1, redundant + len(c["members"]) - 1)
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Find near-duplicate articles and laws")
+    ap.add_argument("--out", default=str(CLUSTERS_PATH))
+    ap.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = ap.parse_args()
+
+    start = time.perf_counter()
+    result = find_duplicates(args.threshold)
+    elapsed = time.perf_counter() - start
+
+    out = pathlib.Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf8")
+
+    for level in ("articles", "laws"):
+        scopes = _summary(result[level])
+        detail = ", ".join(f"{scope}: {n} clusters / {redundant} copies"
+                           for scope, (n, redundant) in sorted(scopes.items())) or "none"
+        print(f"🧬 {level}: {result[f'{level}_checked']} checked → {detail}")
+        if "law" in scopes:
+            print(f"⚠️  {scopes['law'][0]} {level[:-1]} clusters repeat inside a single law – "
+                  "check the scraper output before treating them as duplicates")
+    print(f"✅ Cluster map → {out} ({elapsed:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
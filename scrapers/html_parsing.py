@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import os
+from functools import lru_cache
+from typing import Any, List
+
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+# One place to choose the BeautifulSoup tree builder for every scraper.
+# The default stays "html.parser", which every extractor was written
+# against. lxml is several times faster but repairs malformed markup
+# differently. Opt in with SCRAPER_HTML_PARSER=lxml once
+# bench_html_parsing.py reports identical output for your saved pages.
+
+BACKEND = os.environ.get("SCRAPER_HTML_PARSER") or "html.parser"
+
+
+def set_backend(name: str) -> None:
+    global BACKEND
+    BACKEND = name
+
+
+def make_soup(
+    markup: str | bytes,
+    only: SoupStrainer | None = None,
+    backend: str | None = None,
+) -> BeautifulSoup:
+    """Parse *markup*; with *only*, build just the subtrees it matches."""
+    return BeautifulSoup(markup, backend or BACKEND, parse_only=only)
+
+
+@lru_cache(maxsize=None)
+def compile_selector(selector: str) -> Any:
+    return soupsieve.compile(selector)
+
+
+class Selector:
+    """A CSS selector compiled once at import time and reused per document."""
+
+    def __init__(self, selector: str) -> None:
+        self.selector = selector
+        self._compiled = compile_selector(selector)
+
+    def select(self, node: Tag) -> List[Tag]:
+        return self._compiled.select(node)
+
+    def select_one(self, node: Tag) -> Tag | None:
+        return self._compiled.select_one(node)
+
+    def __repr__(self) -> str:
+        return f"Selector({self.selector!r})"
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pathlib
+import threading
+import time
+from typing import Any, Dict
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# On-disk HTTP cache shared by the scrapers. Bodies are stored under the
+# SHA-256 of the URL together with their ETag / Last-Modified validators;
+# stale entries are revalidated with a conditional GET so unchanged pages
+# come back as cheap 304s.
+
+CACHE_DIR = pathlib.Path(os.environ.get("SCRAPER_HTTP_CACHE", "data/.http_cache"))
+TTL       = 6 * 3600             # seconds an entry is served without revalidation
+MAX_BYTES = 512 * 1024 * 1024    # total body size before LRU eviction
+
+
+class HttpCache:
+    def __init__(
+        self,
+        root: pathlib.Path | str = CACHE_DIR,
+        ttl: float = TTL,
+        max_bytes: int = MAX_BYTES,
+    ) -> None:
+        self.root = pathlib.Path(root)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {"hit": 0, "revalidated": 0, "miss": 0}
+        self._lock = threading.Lock()
+        self._size: int | None = None
+
+    # storage layout
+    def _paths(self, url: str) -> tuple[pathlib.Path, pathlib.Path]:
+        key = hashlib.sha256(url.encode("utf8")).hexdigest()
+        base = self.root / key[:2] / key
+        return base.with_suffix(".body"), base.with_suffix(".json")
+
+    def _load(self, url: str) -> tuple[Dict[str, Any], bytes] | None:
+        body_path, meta_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text("utf8"))
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url:
+            return None
+        return meta, body
+
+    def _write_meta(self, meta_path: pathlib.Path, meta: Dict[str, Any]) -> None:
+        tmp = meta_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(meta, ensure_ascii=False), "utf8")
+        os.replace(tmp, meta_path)
+
+    def _store(self, url: str, resp: requests.Response) -> None:
+        body_path, meta_path = self._paths(url)
+        body_path.parent.mkdir(parents=True, exist_ok=True)
+        old = self._load(url)
+        now = time.time()
+        meta = {
+            "url": url,
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "content_type": resp.headers.get("Content-Type"),
+            "encoding": resp.encoding,
+            "size": len(resp.content),
+            "stored_at": now,
+            "used_at": now,
+        }
+        tmp = body_path.with_suffix(".part")
+        tmp.write_bytes(resp.content)
+        os.replace(tmp, body_path)
+        self._write_meta(meta_path, meta)
+
+        with self._lock:
+            if self._size is not None:
+                self._size += meta["size"] - (old[0]["size"] if old else 0)
+        self.evict()
+
+    def _response(self, url: str, meta: Dict[str, Any], body: bytes) -> requests.Response:
+        resp = requests.Response()
+        resp.url = url
+        resp.status_code = 200
+        resp._content = body
+        resp.encoding = meta.get("encoding")
+        resp.headers = CaseInsensitiveDict(
+            {
+                k: v
+                for k, v in {
+                    "ETag": meta.get("etag"),
+                    "Last-Modified": meta.get("last_modified"),
+                    "Content-Type": meta.get("content_type"),
+                    "X-Cache": "HIT",
+                }.items()
+                if v
+            }
+        )
+        return resp
+
+    def _touch(self, url: str, meta: Dict[str, Any], revalidated: bool) -> None:
+        meta["used_at"] = time.time()
+        if revalidated:
+            meta["stored_at"] = meta["used_at"]
+        try:
+            self._write_meta(self._paths(url)[1], meta)
+        except OSError:
+            pass
+
+    def _count(self, kind: str) -> None:
+        with self._lock:
+            self.stats[kind] += 1
+
+    # public API
+    def get(
+        self, url: str, session: requests.Session | None = None, **kwargs: Any
+    ) -> requests.Response:
+        """Drop-in for ``session.get(url, **kwargs)`` backed by the disk cache."""
+        cached = self._load(url)
+        if cached:
+            meta, body = cached
+            if time.time() - meta["stored_at"] < self.ttl:
+                self._count("hit")
+                self._touch(url, meta, revalidated=False)
+                return self._response(url, meta, body)
+
+            headers = dict(kwargs.pop("headers", None) or {})
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+            kwargs["headers"] = headers
+
+        resp = (session or requests).get(url, **kwargs)
+
+        if cached and resp.status_code == 304:
+            self._count("revalidated")
+            self._touch(url, meta, revalidated=True)
+            return self._response(url, meta, body)
+
+        self._count("miss")
+        if resp.status_code == 200:
+            try:
+                self._store(url, resp)
+            except OSError:
+                pass
+        return resp
+
+    def size(self) -> int:
+        with self._lock:
+            if self._size is None:
+                self._size = sum(
+                    p.stat().st_size for p in self.root.glob("*/*.body")
+                )
+            return self._size
+
+    def evict(self) -> None:
+        """Drop least recently used entries until the cache fits ``max_bytes``."""
+        if self.size() <= self.max_bytes:
+            return
+        entries = []
+        for meta_path in self.root.glob("*/*.json"):
+            try:
+                meta = json.loads(meta_path.read_text("utf8"))
+            except (OSError, ValueError):
+                continue
+            entries.append((meta.get("used_at", 0), meta.get("size", 0), meta_path))
+
+        entries.sort()
+        with self._lock:
+            for _, size, meta_path in entries:
+                if self._size <= self.max_bytes:
+                    break
+                meta_path.with_suffix(".body").unlink(missing_ok=True)
+                meta_path.unlink(missing_ok=True)
+                self._size -= size
+
+    def summary(self) -> str:
+        s = self.stats
+        return f"hit: {s['hit']}, revalidated: {s['revalidated']}, miss: {s['miss']}"
+
+
+CACHE = HttpCache()
+
+
+def cached_get(
+    url: str, session: requests.Session | None = None, **kwargs: Any
+) -> requests.Response:
+    return CACHE.get(url, session, **kwargs)
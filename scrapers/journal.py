@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Set, Tuple
+
+# Append-only JSONL journal for long scraping runs. Every finished record is
+# written and fsync'd as soon as it is ready, and a small checkpoint file
+# records the byte offset of the last complete line. A crashed run can be
+# resumed from the journal, and the final pretty-printed JSON is assembled
+# by streaming the journal back in source order.
+
+
+def _fsync_write(path: pathlib.Path, data: str) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w", encoding="utf8") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class Journal:
+    def __init__(self, output_path: str | pathlib.Path, resume: bool = False) -> None:
+        self.output_path = pathlib.Path(output_path)
+        stem = self.output_path.with_name(self.output_path.stem)
+        self.path = stem.with_suffix(".journal.jsonl")
+        self.checkpoint_path = stem.with_suffix(".checkpoint.json")
+        self.done: Set[str] = set()
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        offset = 0
+        if resume:
+            offset = self._recover()
+        self._fh = open(self.path, "r+b" if resume and self.path.exists() else "wb")
+        self._fh.truncate(offset)   # drop a torn last line, or everything
+        self._fh.seek(offset)
+        self._count = len(self.done)
+
+        if resume and self.done:
+            print(f"↩️  Resuming: {len(self.done)} records already in {self.path.name}")
+
+    def _recover(self) -> int:
+        try:
+            checkpoint = json.loads(self.checkpoint_path.read_text("utf8"))
+            offset = int(checkpoint["offset"])
+        except (OSError, ValueError, KeyError):
+            offset = 0
+        if not self.path.exists():
+            return 0
+        for _, key, _ in self._scan(limit=offset):
+            self.done.add(key)
+        return offset
+
+    def _scan(self, limit: int | None = None) -> Iterator[Tuple[int, str, int]]:
+        """Yield ``(idx, key, byte_offset)`` for every complete journal line."""
+        pos = 0
+        with open(self.path, "rb") as f:
+            for raw in f:
+                if limit is not None and pos + len(raw) > limit:
+                    break
+                if raw.endswith(b"\n"):
+                    entry = json.loads(raw)
+                    yield entry["idx"], entry["key"], pos
+                pos += len(raw)
+
+    def append(self, idx: int, key: str, record: Dict[str, Any]) -> None:
+        line = json.dumps(
+            {"idx": idx, "key": key, "record": record}, ensure_ascii=False
+        ).encode("utf8") + b"\n"
+        with self._lock:
+            self._fh.write(line)
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+            self.done.add(key)
+            self._count += 1
+            _fsync_write(
+                self.checkpoint_path,
+                json.dumps(
+                    {
+                        "offset": self._fh.tell(),
+                        "records": self._count,
+                        "last_key": key,
+                        "updated": datetime.now().isoformat(timespec="seconds"),
+                    },
+                    ensure_ascii=False,
+                ),
+            )
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Stream records back in source order, one line in memory at a time."""
+        index: List[Tuple[int, int]] = sorted(
+            (idx, pos) for idx, _, pos in self._scan()
+        )
+        with open(self.path, "rb") as f:
+            for _, pos in index:
+                f.seek(pos)
+                yield json.loads(f.readline())["record"]
+
+    def finalize(self, wrap_key: str | None = None) -> int:
+        """Write the combined JSON output and remove the journal.
+
+        The layout matches ``json.dumps(records, ensure_ascii=False, indent=2)``
+        (wrapped as ``{wrap_key: records}`` when *wrap_key* is given).
+        """
+        with self._lock:
+            self._fh.close()
+
+        pad = "    " if wrap_key else "  "
+        tmp = self.output_path.with_suffix(self.output_path.suffix + ".tmp")
+        count = 0
+        with open(tmp, "w", encoding="utf8") as out:
+            if wrap_key:
+                out.write("{\n  " + json.dumps(wrap_key, ensure_ascii=False) + ": ")
+            out.write("[")
+            for record in self.records():
+                dumped = json.dumps(record, ensure_ascii=False, indent=2)
+                out.write(("," if count else "") + "\n" + pad)
+                out.write(dumped.replace("\n", "\n" + pad))
+                count += 1
+            out.write(("\n" + pad[:-2] + "]") if count else "]")
+            if wrap_key:
+                out.write("\n}")
+        os.replace(tmp, self.output_path)
+
+        self.path.unlink(missing_ok=True)
+        self.checkpoint_path.unlink(missing_ok=True)
+        return count
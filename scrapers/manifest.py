@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pathlib
+import threading
+from typing import Any, Dict, Iterable, Iterator, Set
+
+from scrapers.corpus_reader import iter_items
+
+# Per-law content hashes of the DOM region a scraper parses. When a law's
+# region hashes the same as last run, its record from the previous output
+# file is reused instead of being re-extracted. The previous output is
+# streamed on demand: records are read in file order as laws are looked up,
+# and one that is passed over is kept only until its own lookup.
+#
+# The manifest also records the scraper's PARSER_VERSION. An unchanged page
+# can still need re-parsing when the extraction code changes, so each
+# scraper bumps its PARSER_VERSION with any such change. A manifest written
+# under another version (or in the old header-less format) is discarded.
+
+
+def region_hash(*nodes: Any) -> str:
+    h = hashlib.sha256()
+    for node in nodes:
+        if node is not None:
+            h.update(str(node).encode("utf8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def manifest_path(output_path: str | pathlib.Path) -> pathlib.Path:
+    out = pathlib.Path(output_path)
+    return out.with_name(out.stem + ".manifest.json")
+
+
+class ChangeManifest:
+    def __init__(
+        self,
+        output_path: str | pathlib.Path,
+        key: str = "law_id",
+        records: Iterable[Dict[str, Any]] | None = None,
+        parser_version: int = 1,
+    ) -> None:
+        self.output_path = pathlib.Path(output_path)
+        self.path = manifest_path(self.output_path)
+        self.key = key
+        self.parser_version = parser_version
+        self.stats = {"unchanged": 0, "changed": 0}
+        self._lock = threading.Lock()
+
+        try:
+            data = json.loads(self.path.read_text("utf8"))
+        except (OSError, ValueError):
+            data = {}
+        self.hashes: Dict[str, str] = {}
+        if isinstance(data, dict) and data.get("parser_version") == parser_version:
+            self.hashes = data.get("hashes") or {}
+        elif data:
+            print(f"♻️  {self.path.name}: parser changed since the last run, re-parsing all laws")
+
+        # laws whose previous record may still be reused
+        self._wanted: Set[str] = set(self.hashes)
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._records: Iterator[Dict[str, Any]] = (
+            iter(records) if records is not None else self._stream_records()
+        )
+
+    def _stream_records(self) -> Iterator[Dict[str, Any]]:
+        if not self._wanted or not self.output_path.exists():
+            return
+        try:
+            yield from iter_items(str(self.output_path))
+        except (OSError, ValueError):
+            return   # truncated or hand-broken output: nothing more to reuse
+
+    def _previous(self, law_id: str) -> Dict[str, Any] | None:
+        prev = self._pending.pop(law_id, None)
+        if prev is not None:
+            return prev
+        for record in self._records:
+            rid = str(record.get(self.key) or "")
+            if rid == law_id:
+                return record
+            if rid in self._wanted:
+                self._pending[rid] = record
+        return None
+
+    def reuse(self, law_id: str, digest: str) -> Dict[str, Any] | None:
+        """Previous record for *law_id* if its region hash is unchanged."""
+        with self._lock:
+            prev = None
+            if law_id in self._wanted and self.hashes.get(law_id) == digest:
+                prev = self._previous(law_id)
+            self._wanted.discard(law_id)
+            self._pending.pop(law_id, None)
+            if prev is not None:
+                self.stats["unchanged"] += 1
+                return prev
+            self.stats["changed"] += 1
+            return None
+
+    def update(self, law_id: str, digest: str) -> None:
+        with self._lock:
+            self.hashes[law_id] = digest
+
+    def save(self) -> None:
+        with self._lock:
+            tmp = self.path.with_suffix(".tmp")
+            data = {"parser_version": self.parser_version, "hashes": self.hashes}
+            tmp.write_text(json.dumps(data, indent=2), "utf8")
+            os.replace(tmp, self.path)
+
+    def summary(self) -> str:
+        return f"unchanged: {self.stats['unchanged']}, re-parsed: {self.stats['changed']}"
@@ -2,8 +2,16 @@ from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
-import time
+from bs4 import SoupStrainer
+import os
+import sys
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from scrapers.html_parsing import make_soup
+from scrapers.readiness import wait_for_page_ready, wait_for_scroll_settled
 
 def scrape_rule_clickable_parts():
     options = Options()
@@ -14,11 +22,12 @@ def scrape_rule_clickable_parts():
     driver.get("https://mc.gov.sa/ar/Regulations/Pages/default.aspx")
 
     # Wait and scroll to ensure all dynamic content is loaded
-    time.sleep(3)
+    loaded = wait_for_page_ready(driver, timeout=10)
     driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(3)
+    scrolled = wait_for_scroll_settled(driver) + wait_for_page_ready(driver)
+    print(f"⏱ page ready in {loaded:.2f}s, scroll settled in {scrolled:.2f}s")
 
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+    soup = make_soup(driver.page_source, only=SoupStrainer("a", class_="rule-clickable-part"))
     driver.quit()
 
     base_url = "https://mc.gov.sa/ar/Regulations/Pages/"
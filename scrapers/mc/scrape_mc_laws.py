@@ -1,14 +1,122 @@
-import json
-import time
-from bs4 import BeautifulSoup
+import argparse
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from scrapers.readiness import wait_for_dom_stable, wait_for_page_ready
+from scrapers.html_parsing import Selector, make_soup
+from scrapers.journal import Journal
+from scrapers.manifest import ChangeManifest, region_hash
+from scrapers.static_fetch import fetch_static, path_summary, record_path
+
+POOL_SIZE = 4          # browsers scraping in parallel
+RECYCLE_AFTER = 25     # pages served before a browser is restarted
+ARTICLE_SEL = ".rules-article-container"
+HTTP_FIRST = True      # try a plain GET before rendering in Chrome
+PARSER_VERSION = 2     # bump when extraction changes; invalidates the manifest
+
+ARTICLE_CONTAINER = Selector(ARTICLE_SEL)
+ACCORDION_HEADER = Selector("div.accordion > h3")
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def chromedriver_path():
+    # ChromeDriverManager().install() hits the network; do it once per run
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+        return _driver_path
+
+
+def init_driver():
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    return webdriver.Chrome(service=Service(chromedriver_path()), options=options)
+
+
+def is_alive(driver):
+    try:
+        driver.execute_script("return 1")
+        return True
+    except WebDriverException:
+        return False
+
+
+def quit_driver(driver):
+    try:
+        driver.quit()
+    except WebDriverException:
+        pass
+
+
+class DriverPool:
+    """A fixed set of long-lived headless browsers shared by worker threads.
+
+    Browsers are started lazily, health-checked on every checkout and
+    replaced after ``recycle_after`` pages to keep Chrome memory in check.
+    """
+
+    def __init__(self, size=POOL_SIZE, recycle_after=RECYCLE_AFTER):
+        self.size = size
+        self.recycle_after = recycle_after
+        self._idle = queue.Queue()
+        self._pages = {}
+        for _ in range(size):
+            self._idle.put(None)
+
+    def acquire(self):
+        driver = self._idle.get()
+        if driver is not None and (
+            self._pages.get(driver, 0) >= self.recycle_after or not is_alive(driver)
+        ):
+            self._pages.pop(driver, None)
+            quit_driver(driver)
+            driver = None
+        if driver is None:
+            try:
+                driver = init_driver()
+            except Exception:
+                self._idle.put(None)
+                raise
+            self._pages[driver] = 0
+        return driver
+
+    def release(self, driver):
+        self._pages[driver] = self._pages.get(driver, 0) + 1
+        self._idle.put(driver)
+
+    def close(self):
+        for _ in range(self.size):
+            driver = self._idle.get()
+            if driver is not None:
+                self._pages.pop(driver, None)
+                quit_driver(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
 
 def load_mc_law_links(file_path="data/raw_data/mc_laws.txt"):
     links = []
@@ -23,7 +131,7 @@ def load_mc_law_links(file_path="data/raw_data/mc_laws.txt"):
 def extract_articles(container):
     articles = []
 
-    for art in container.select(".rules-article-container"):
+    for art in ARTICLE_CONTAINER.select(container):
         # Handle both modified and unmodified containers
         article_number = "بدون رقم"
 
@@ -47,9 +155,25 @@ def extract_articles(container):
         })
 
     return articles
+
+
+def top_level_headers(container):
+    """
+    Accordion headers of *container* itself. The selector also matches the
+    headers of accordions nested inside a panel (chapters inside a part),
+    which used to be emitted a second time as standalone parts.
+    """
+    headers = []
+    for h3 in ACCORDION_HEADER.select(container):
+        panel = h3.find_parent("div", class_="ui-accordion-content")
+        if panel is None or panel is container or not any(p is container for p in panel.parents):
+            headers.append(h3)
+    return headers
+
+
 def extract_structured_content(container):
     structure = []
-    part_tags = container.select("div.accordion > h3")
+    part_tags = top_level_headers(container)
 
     if part_tags:
         for part_tag in part_tags:
@@ -57,7 +181,7 @@ def extract_structured_content(container):
             part_div = part_tag.find_next_sibling("div", class_="ui-accordion-content")
             part = {"part_title": part_title, "chapters": [], "articles": []}
 
-            chapter_tags = part_div.select("div.accordion > h3")
+            chapter_tags = top_level_headers(part_div)
             if chapter_tags:
                 for chapter_tag in chapter_tags:
                     chapter_title = chapter_tag.get_text(strip=True)
@@ -72,7 +196,7 @@ def extract_structured_content(container):
 
             structure.append(part)
     else:
-        chapter_tags = container.select("div.accordion > h3")
+        chapter_tags = top_level_headers(container)
         if chapter_tags:
             for chapter_tag in chapter_tags:
                 chapter_title = chapter_tag.get_text(strip=True)
@@ -95,35 +219,92 @@ def extract_structured_content(container):
     return structure
 
 
+# Opens every jQuery-UI accordion panel in one round-trip and resolves once
+# each header has its content panel in the DOM (or the deadline passes).
+EXPAND_ACCORDIONS_JS = """
+const done = arguments[arguments.length - 1];
+const deadline = Date.now() + arguments[0];
+function expand() {
+  const headers = document.querySelectorAll('.accordion h3');
+  let panels = 0;
+  headers.forEach(function (h) {
+    const panel = h.nextElementSibling;
+    if (!panel || !panel.classList.contains('ui-accordion-content')) return;
+    panels++;
+    h.classList.add('ui-state-active');
+    h.setAttribute('aria-expanded', 'true');
+    panel.classList.add('ui-accordion-content-active');
+    panel.setAttribute('aria-hidden', 'false');
+    panel.style.display = 'block';
+  });
+  if ((headers.length && panels === headers.length) || Date.now() > deadline) {
+    done([headers.length, panels]);
+  } else {
+    setTimeout(expand, 50);
+  }
+}
+expand();
+"""
+EXPAND_TIMEOUT = 10  # seconds
+
+
+def click_accordions(driver, headers):
+    for h in headers:
+        try:
+            driver.execute_script("arguments[0].scrollIntoView();", h)
+            h.click()
+        except Exception:
+            continue
+    return wait_for_dom_stable(driver)
+
+
 def expand_all_accordions(driver):
     try:
         WebDriverWait(driver, 15).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, ".accordion h3"))
         )
-        headers = driver.find_elements(By.CSS_SELECTOR, ".accordion h3")
-        for h in headers:
-            try:
-                driver.execute_script("arguments[0].scrollIntoView();", h)
-                h.click()
-                time.sleep(0.2)
-            except Exception:
-                continue
+        driver.set_script_timeout(EXPAND_TIMEOUT + 5)
+        n_headers, n_panels = driver.execute_async_script(
+            EXPAND_ACCORDIONS_JS, EXPAND_TIMEOUT * 1000
+        )
+        if n_panels < n_headers:
+            # some panels are only created on click – fall back to clicking
+            print(f"⚠️ {n_headers - n_panels} accordion panels missing, clicking headers")
+            headers = driver.find_elements(By.CSS_SELECTOR, ".accordion h3")
+            settled = click_accordions(driver, headers)
+            print(f"⏱ {len(headers)} accordions settled in {settled:.2f}s")
     except Exception:
         print("⚠️ Accordion headers not found.")
 
 
-def scrape_law_sections(url):
-    options = Options()
-    options.add_argument("--headless")
-    options.add_argument("--no-sandbox")
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    driver.get(url)
+def render_law_page(url, driver=None):
+    own_driver = driver is None
+    if own_driver:
+        driver = init_driver()
+    try:
+        driver.get(url)
+        expand_all_accordions(driver)
+        wait_for_page_ready(driver)  # Final wait for content to load
+        html = driver.page_source
+    finally:
+        if own_driver:
+            driver.quit()
+    record_path(url, "browser")
+    return html
 
-    expand_all_accordions(driver)
 
-    time.sleep(1)  # Final wait for content to load
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    driver.quit()
+def fetch_law_page(url):
+    # accordion panels are plain hidden markup, so server HTML is often enough
+    return fetch_static(url, ARTICLE_SEL) if HTTP_FIRST else None
+
+
+def scrape_law_sections(url, driver=None, manifest=None):
+    html = fetch_law_page(url) or render_law_page(url, driver)
+    return parse_law_page(html, url, manifest)
+
+
+def parse_law_page(html, url, manifest=None):
+    soup = make_soup(html)
 
     title = soup.find("h2").get_text(strip=True) if soup.find("h2") else "بدون عنوان"
     result = {
@@ -135,35 +316,80 @@ def scrape_law_sections(url):
     }
 
     rule_container = soup.find("div", class_="rule-container")
+    reg_container = soup.find("div", class_="regulation-container")
+
+    if manifest is not None:
+        digest = region_hash(rule_container, reg_container)
+        prev = manifest.reuse(result["law_id"], digest)
+        manifest.update(result["law_id"], digest)
+        if prev is not None:
+            result["rules"] = prev.get("rules", [])
+            result["regulations"] = prev.get("regulations", [])
+            return result
+
     if rule_container:
         result["rules"] = extract_structured_content(rule_container)
 
-    reg_container = soup.find("div", class_="regulation-container")
     if reg_container:
         result["regulations"] = extract_structured_content(reg_container)
 
     return result
 
 
-def process_all_mc_laws():
+def scrape_with_pool(pool, url, manifest=None):
+    html = fetch_law_page(url)
+    if html is None:
+        driver = pool.acquire()
+        try:
+            html = render_law_page(url, driver)
+        finally:
+            pool.release(driver)
+    return parse_law_page(html, url, manifest)
+
+
+def process_all_mc_laws(workers=POOL_SIZE, recycle_after=RECYCLE_AFTER, full=False, resume=False):
     links = load_mc_law_links()
-    all_data = []
+    output_path = "data/scraped_data/mc_laws_detailed.json"
+    manifest = ChangeManifest(output_path, records=[] if full else None,
+                              parser_version=PARSER_VERSION)
+    journal = Journal(output_path, resume=resume)
 
-    for i, (url, name) in enumerate(links):
+    def job(item):
+        i, (url, name) = item
+        if url.split("lawId=")[-1] in journal.done:
+            return
         print(f"🔍 [{i+1}/{len(links)}] Scraping: {name}")
         try:
-            law_data = scrape_law_sections(url)
-            all_data.append(law_data)
+            law_data = scrape_with_pool(pool, url, manifest)
         except Exception as e:
             print(f"❌ Error scraping {name}: {e}")
-        time.sleep(2)
+            return
+        journal.append(i, law_data["law_id"], law_data)
 
-    output_path = "data/scraped_data/mc_laws_detailed.json"
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(all_data, f, ensure_ascii=False, indent=2)
+    with DriverPool(workers, recycle_after) as pool, \
+            ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(job, enumerate(links)))
+
+    count = journal.finalize()
+    manifest.save()
 
-    print(f"\n✅ تم حفظ جميع القوانين في: {output_path}")
+    print(f"\n✅ تم حفظ جميع القوانين ({count}) في: {output_path}")
+    print(f"🧮 Laws → {manifest.summary()}")
+    print(f"🌐 Fetch paths → {path_summary()}")
 
 
 if __name__ == "__main__":
-    process_all_mc_laws()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Scrape MC laws")
+    parser.add_argument("--workers", type=int, default=POOL_SIZE,
+                        help="number of pooled browsers")
+    parser.add_argument("--recycle-after", type=int, default=RECYCLE_AFTER,
+                        help="restart a browser after this many pages")
+    parser.add_argument("--browser-only", action="store_true",
+                        help="skip the plain-HTTP fast path")
+    parser.add_argument("--full", action="store_true",
+                        help="re-parse every law, ignoring the change manifest")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue an interrupted run from its journal")
+    args = parser.parse_args()
+    HTTP_FIRST = not args.browser_only
+    process_all_mc_laws(args.workers, args.recycle_after, args.full, args.resume)
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from selenium.common.exceptions import WebDriverException
+
+# Condition-based waits for the Selenium scrapers. Each helper polls a cheap
+# JS probe until its value stops changing for `quiet` seconds (or `timeout`
+# runs out) and returns the seconds actually spent waiting.
+
+POLL    = 0.05
+QUIET   = 0.3
+TIMEOUT = 5.0
+
+DOM_SIZE_JS      = "return document.getElementsByTagName('*').length"
+SCROLL_HEIGHT_JS = "return document.body.scrollHeight"
+# null while the page is still busy, otherwise the number of fetched resources
+NETWORK_JS = """
+if (document.readyState !== 'complete') return null;
+if (window.jQuery && window.jQuery.active) return null;
+return performance.getEntriesByType('resource').length;
+"""
+
+
+def _probe(driver: Any, script: str) -> Any:
+    try:
+        return driver.execute_script(script)
+    except WebDriverException:
+        return None
+
+
+def wait_until_stable(
+    driver: Any,
+    script: str,
+    timeout: float = TIMEOUT,
+    quiet: float = QUIET,
+    poll: float = POLL,
+) -> float:
+    start = time.monotonic()
+    last = _probe(driver, script)
+    since = start
+    while True:
+        now = time.monotonic()
+        if last is not None and now - since >= quiet:
+            break
+        if now - start >= timeout:
+            break
+        time.sleep(poll)
+        value = _probe(driver, script)
+        if value is None or value != last:
+            last, since = value, time.monotonic()
+    return time.monotonic() - start
+
+
+def wait_for_dom_stable(driver: Any, timeout: float = TIMEOUT, quiet: float = QUIET) -> float:
+    return wait_until_stable(driver, DOM_SIZE_JS, timeout, quiet)
+
+
+def wait_for_scroll_settled(driver: Any, timeout: float = TIMEOUT, quiet: float = QUIET) -> float:
+    return wait_until_stable(driver, SCROLL_HEIGHT_JS, timeout, quiet)
+
+
+def wait_for_network_idle(driver: Any, timeout: float = TIMEOUT, quiet: float = QUIET) -> float:
+    return wait_until_stable(driver, NETWORK_JS, timeout, quiet)
+
+
+def wait_for_page_ready(driver: Any, timeout: float = TIMEOUT, quiet: float = QUIET) -> float:
+    """Network idle followed by a stable DOM; returns the total time spent."""
+    spent = wait_for_network_idle(driver, timeout, quiet)
+    return spent + wait_for_dom_stable(driver, max(0.0, timeout - spent), quiet)
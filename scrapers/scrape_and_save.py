@@ -1,14 +1,30 @@
 
 from __future__ import annotations
 
-import json
+import argparse
+import os
 import pathlib
 import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List
+from functools import partial
+from typing import Any, Dict, Iterator, List, Mapping
+from urllib.parse import urlsplit
 
 import requests
 from bs4 import BeautifulSoup, Tag
+from requests.adapters import HTTPAdapter
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from scrapers.html_parsing import Selector, make_soup
+from scrapers.http_cache import CACHE
+from scrapers.journal import Journal
+from scrapers.manifest import ChangeManifest, region_hash
 
 #  Session
 SESSION = requests.Session()
@@ -21,18 +37,48 @@ SESSION.headers.update(
     }
 )
 
+MAX_WORKERS  = 8       # threads fetching/parsing laws at once
+PER_HOST_CAP = 4       # concurrent requests allowed against a single host
+PARSER_VERSION = 1     # bump when extraction changes; invalidates the manifest
+
+# keep enough pooled keep-alive connections for every worker
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=MAX_WORKERS))
+
+_host_slots: dict[str, threading.BoundedSemaphore] = {}
+_host_lock = threading.Lock()
+
 PART_RE       = re.compile(r"^\s*الباب\s+",  re.I)
 CHAP_RE       = re.compile(r"^\s*الفصل\s+", re.I)
 CANCEL_CLASSES = {"canceled", "canceled-article"}
 
+SYSTEM_INFO_SEL  = Selector("div.system_info")
+SYSTEM_BRIEF_SEL = Selector("div.system_brief .HTMLContainer")
+STRUCTURE_SEL    = Selector("h3.center, div.article_item")
+
 # Helpers 
 def text(node: Tag | None, sep: str = "\n") -> str:
     return node.get_text(sep, strip=True) if node else ""
 
 
+def set_per_host_cap(cap: int) -> None:
+    global PER_HOST_CAP
+    with _host_lock:
+        PER_HOST_CAP = max(1, cap)
+        _host_slots.clear()
+
+
+def host_slot(url: str) -> threading.BoundedSemaphore:
+    host = urlsplit(url).netloc
+    with _host_lock:
+        if host not in _host_slots:
+            _host_slots[host] = threading.BoundedSemaphore(PER_HOST_CAP)
+        return _host_slots[host]
+
+
 def fetch_html(url: str) -> str | None:
     try:
-        r = SESSION.get(url, timeout=20)
+        with host_slot(url):
+            r = CACHE.get(url, SESSION, timeout=20)
         r.raise_for_status()
         return r.text
     except requests.RequestException:
@@ -44,7 +90,7 @@ def fetch_html(url: str) -> str | None:
 def extract_metadata(soup: BeautifulSoup) -> Dict[str, str]:
     meta: dict[str, str] = {}
 
-    info = soup.select_one("div.system_info")
+    info = SYSTEM_INFO_SEL.select_one(soup)
     if info:
         for row in info.select("div"):
             lab  = text(row.select_one("label"))
@@ -52,13 +98,23 @@ def extract_metadata(soup: BeautifulSoup) -> Dict[str, str]:
             if lab:
                 meta[lab] = val
 
-    brief = soup.select_one("div.system_brief .HTMLContainer")
+    brief = SYSTEM_BRIEF_SEL.select_one(soup)
     meta["نبذة عن النظام"] = text(brief, sep=" ") if brief else ""
     return meta
 
 
 #  Article extraction 
-def make_article(div: Tag, root: Tag) -> Dict[str, Any]:
+def index_popups(root: Tag) -> Dict[str, Tag]:
+    """Map article id → its amendments popup, in one pass over the tree."""
+    popups: dict[str, Tag] = {}
+    for div in root.find_all("div", class_="popup-list"):
+        for cls in div.get("class", []):
+            if cls != "popup-list":
+                popups.setdefault(cls, div)
+    return popups
+
+
+def make_article(div: Tag, popups: Mapping[str, Tag]) -> Dict[str, Any]:
     classes   = set(div.get("class", []))
     canceled  = bool(classes & CANCEL_CLASSES)
 
@@ -68,8 +124,7 @@ def make_article(div: Tag, root: Tag) -> Dict[str, Any]:
     amendments: list[str] = []
     link = div.find("a", class_="ancArticlePrevVersions")
     if link and link.has_attr("data-articleid"):
-        aid   = link["data-articleid"]
-        popup = root.find("div", class_=f"{aid} popup-list")
+        popup = popups.get(link["data-articleid"])
         if popup:
             for blk in popup.find_all("div", class_="HTMLContainer"):
                 t = text(blk)
@@ -84,12 +139,17 @@ def make_article(div: Tag, root: Tag) -> Dict[str, Any]:
     }
 
 
-def build_structure(root: Tag) -> List[Dict[str, Any]]:
+def build_structure(
+    root: Tag, popups: Mapping[str, Tag] | None = None
+) -> List[Dict[str, Any]]:
+    if popups is None:
+        popups = index_popups(root)
+
     structure: list[dict[str, Any]] = []
     current_part: dict[str, Any] | None = None
     current_chapter: dict[str, Any] | None = None
 
-    for node in root.select("h3.center, div.article_item"):
+    for node in STRUCTURE_SEL.select(root):
         if node.name == "h3" and PART_RE.match(node.text):
             current_part = {"part_title": text(node), "chapters": [], "articles": []}
             structure.append(current_part)
@@ -110,7 +170,7 @@ def build_structure(root: Tag) -> List[Dict[str, Any]]:
             continue
 
         if node.name == "div" and "article_item" in node.get("class", []):
-            article = make_article(node, root)
+            article = make_article(node, popups)
 
             if current_chapter:
                 current_chapter["articles"].append(article)
@@ -145,22 +205,32 @@ def load_sources(path: str = "data/raw_data/boe_laws.txt") -> List[Dict[str, str
 
 
 # Scraper
-def scrape_boe_law(entry: Dict[str, str]) -> Dict[str, Any] | None:
+def scrape_boe_law(
+    entry: Dict[str, str], manifest: ChangeManifest | None = None
+) -> Dict[str, Any] | None:
     url  = f"https://laws.boe.gov.sa/BoeLaws/Laws/LawDetails/{entry['law_id']}/1"
     html = fetch_html(url)
     if not html:
         return None
 
-    soup  = BeautifulSoup(html, "html.parser")
+    soup  = make_soup(html)
     meta  = extract_metadata(soup)
     status = meta.get("الحالة", "").strip()
 
     root = soup.find(id="divLawText") or soup
 
+    digest = region_hash(root, status)
+    prev = manifest.reuse(entry["law_id"], digest) if manifest else None
+
     rules: list[dict[str, Any]] = []
-    if status != "لاغي":       
+    if prev is not None:
+        rules = prev["rules"]
+    elif status != "لاغي":       
         rules = build_structure(root)
 
+    if manifest:
+        manifest.update(entry["law_id"], digest)
+
     return {
         "law_id": entry["law_id"],
         "name":   entry["name"],
@@ -170,22 +240,67 @@ def scrape_boe_law(entry: Dict[str, str]) -> Dict[str, Any] | None:
     }
 
 
+def _scrape_logged(
+    entry: Dict[str, str], manifest: ChangeManifest | None = None
+) -> Dict[str, Any] | None:
+    print(f"📖 Scraping «{entry['name']}» …")
+    return scrape_boe_law(entry, manifest)
+
+
+def scrape_all(
+    sources: List[Dict[str, str]],
+    workers: int = MAX_WORKERS,
+    manifest: ChangeManifest | None = None,
+) -> Iterator[Dict[str, Any] | None]:
+    """Scrape *sources* on a thread pool, yielding results in source order."""
+    job = partial(_scrape_logged, manifest=manifest)
+    if workers <= 1:
+        yield from map(job, sources)
+        return
+
+    SESSION.mount(
+        "https://", HTTPAdapter(pool_connections=4, pool_maxsize=workers)
+    )
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(job, sources)
+
+
 #  Main 
 def main() -> None:
-    results: list[dict[str, Any]] = []
+    ap = argparse.ArgumentParser(description="Scrape BOE laws")
+    ap.add_argument("--workers", type=int, default=MAX_WORKERS,
+                    help="laws fetched in parallel (1 = sequential)")
+    ap.add_argument("--per-host", type=int, default=PER_HOST_CAP,
+                    help="max concurrent requests per host")
+    ap.add_argument("--full", action="store_true",
+                    help="re-parse every law, ignoring the change manifest")
+    ap.add_argument("--resume", action="store_true",
+                    help="continue an interrupted run from its journal")
+    args = ap.parse_args()
+
+    set_per_host_cap(args.per_host)
 
-    for src in load_sources():
-        print(f"📖 Scraping «{src['name']}» …")
-        data = scrape_boe_law(src)
+    out_path = pathlib.Path("data/scraped_data/boe_laws_detailed.json")
+    manifest = ChangeManifest(out_path, records=[] if args.full else None,
+                               parser_version=PARSER_VERSION)
+    journal  = Journal(out_path, resume=args.resume)
+
+    pending = [
+        (idx, src) for idx, src in enumerate(load_sources())
+        if src["law_id"] not in journal.done
+    ]
+    scraped = scrape_all([src for _, src in pending], workers=args.workers, manifest=manifest)
+    for (idx, src), data in zip(pending, scraped):
         if data:
-            results.append(data)
+            journal.append(idx, src["law_id"], data)
 
-    out_path = pathlib.Path("data/scraped_data/boe_laws_detailed.json")
-    out_path.write_text(
-        json.dumps(results, ensure_ascii=False, indent=2), encoding="utf8"
-    )
+    count = journal.finalize()
+    # only after the output exists, so hashes never point at records it lacks
+    manifest.save()
 
-    print(f"\n✅ Saved → {out_path.resolve()}")
+    print(f"\n✅ Saved {count} laws → {out_path.resolve()}")
+    print(f"🧮 Laws → {manifest.summary()}")
+    print(f"🗄  HTTP cache → {CACHE.summary()}")
     print("🕓 Generated at", datetime.now().isoformat(timespec="seconds"))
 
 
@@ -1,13 +1,15 @@
 
 from __future__ import annotations
 
-import json
+import argparse
+import os
 import pathlib
+import queue
 import sys
-import time
+import threading
 import re
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List
 
 from bs4 import BeautifulSoup, Tag
 from selenium import webdriver
@@ -19,6 +21,18 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from scrapers.readiness import (
+    wait_for_dom_stable, wait_for_network_idle, wait_for_scroll_settled,
+)
+from scrapers.html_parsing import Selector, make_soup
+from scrapers.journal import Journal
+from scrapers.manifest import ChangeManifest, region_hash
+from scrapers.static_fetch import fetch_static, path_summary, record_path
+
 PART_SEL    = "div.legislation-content.isParent.is-part"
 SECTION_SEL = "div.legislation-content.is-section"
 STATUS_MAP  = {
@@ -26,6 +40,23 @@ STATUS_MAP  = {
     "is-canceled": "canceled",
     "is-added":    "added",
 }
+WORKERS      = 3     # browsers loading pages in parallel
+URL_TIMEOUT  = 30    # seconds to wait for the sections of one page
+SCROLL_QUIET = 0.7   # height must hold this long (the old fixed pause)
+STRUCTURE_SEL = Selector(f"{PART_SEL}, {SECTION_SEL}")
+META_BOX_SEL  = Selector("div.row.mb-4 > div")
+DESC_SEL      = Selector("p.legislation-description")
+TITLE_SEL     = Selector("h1.legislation-title")
+CONTAINER_SEL = Selector("div.order-1")
+MAX_ATTEMPTS = 3     # loads per URL before it is dropped
+# MOJ renders sections lazily while the page is scrolled, and the page
+# states no article count to check a plain GET against, so the browser is
+# the default path. --http-first opts into the fast path, still guarded by
+# static_complete().
+HTTP_FIRST   = False
+LAZY_SEL     = Selector("[class*='loading'], [class*='skeleton'], [class*='spinner'], "
+                        "[data-src]:not([src])")
+PARSER_VERSION = 1   # bump when extraction changes; invalidates the manifest
 
 
 def init_driver() -> webdriver.Chrome:
@@ -43,15 +74,22 @@ def init_driver() -> webdriver.Chrome:
     driver.set_page_load_timeout(120)
     return driver
 
-def lazy_scroll(driver: webdriver.Chrome, pause: float = 0.7) -> None:
+def lazy_scroll(driver: webdriver.Chrome, timeout: float = 3.0) -> float:
+    """Scroll to the bottom until the page stops growing; returns seconds waited.
+
+    After each scroll the lazy-load requests are awaited before the height is
+    compared, so a slow XHR cannot end the loop with sections still missing."""
+    waited = 0.0
     last_h = driver.execute_script("return document.body.scrollHeight")
     while True:
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight)")
-        time.sleep(pause)
+        waited += wait_for_network_idle(driver, timeout)
+        waited += wait_for_scroll_settled(driver, timeout, quiet=SCROLL_QUIET)
         new_h = driver.execute_script("return document.body.scrollHeight")
         if new_h == last_h:
             break
         last_h = new_h
+    return waited
 
 def try_click(driver: webdriver.Chrome, elem) -> None:
     try:
@@ -59,15 +97,16 @@ def try_click(driver: webdriver.Chrome, elem) -> None:
     except WebDriverException:
         pass
 
-def load_full_page(driver: webdriver.Chrome, url: str) -> str:
+def load_full_page(driver: webdriver.Chrome, url: str, timeout: float = URL_TIMEOUT) -> str:
     driver.get(url)
-    WebDriverWait(driver, 30).until(
+    WebDriverWait(driver, timeout).until(
         EC.presence_of_element_located((By.CSS_SELECTOR, SECTION_SEL))
     )
-    lazy_scroll(driver)
+    scrolled = lazy_scroll(driver)
     for hdr in driver.find_elements(By.CSS_SELECTOR, f"{PART_SEL} h3.title"):
         try_click(driver, hdr)
-    time.sleep(0.4)
+    settled = wait_for_dom_stable(driver)
+    print(f"  ⏱ scroll {scrolled:.2f}s, expand {settled:.2f}s")
     return driver.page_source
 
 
@@ -77,12 +116,12 @@ def text(node: Tag | None, sep: str = "\n") -> str:
 
 def extract_metadata(soup: BeautifulSoup) -> Dict[str, str]:
     meta: Dict[str, str] = {}
-    for box in soup.select("div.row.mb-4 > div"):
+    for box in META_BOX_SEL.select(soup):
         label = text(box.select_one("h4.label"))
         value = text(box.select_one("p"))
         if label:
             meta[label] = value
-    desc = soup.select_one("p.legislation-description")
+    desc = DESC_SEL.select_one(soup)
     if desc:
         meta.setdefault("نبذة عن النظام", text(desc, sep=" "))
     return meta
@@ -115,7 +154,7 @@ def make_article(div: Tag) -> Dict[str, Any]:
 
 def build_structure(container: Tag) -> List[Dict[str, Any]]:
     structure, cur_part = [], None
-    for div in container.select(f"{PART_SEL}, {SECTION_SEL}"):
+    for div in STRUCTURE_SEL.select(container):
         classes = div.get("class", [])
         if "is-part" in classes:
             cur_part = {
@@ -131,16 +170,64 @@ def build_structure(container: Tag) -> List[Dict[str, Any]]:
     return structure
 
 
-def scrape_one(url: str, driver: webdriver.Chrome) -> Dict[str, Any]:
-    html = load_full_page(driver, url)
-    soup = BeautifulSoup(html, "html.parser")
-    name = text(soup.select_one("h1.legislation-title")) or url.split("/")[-1]
+def law_id_of(url: str) -> str:
+    return url.rstrip("/").split("/")[-1]
+
+
+def static_complete(soup: BeautifulSoup) -> bool:
+    """Whether server HTML looks whole: no lazy-load placeholder is left in
+    the law body and every part is followed by at least one section."""
+    container = CONTAINER_SEL.select_one(soup) or soup
+    if LAZY_SEL.select_one(container) is not None:
+        return False
+    empty_part = False
+    for div in STRUCTURE_SEL.select(container):
+        if "is-part" in div.get("class", []):
+            if empty_part:
+                return False
+            empty_part = True
+        else:
+            empty_part = False
+    return not empty_part
+
+
+def fetch_static_page(url: str) -> str | None:
+    if not HTTP_FIRST:
+        return None
+    return fetch_static(url, SECTION_SEL, complete=static_complete)
+
+
+def render_page(driver: webdriver.Chrome, url: str, timeout: float = URL_TIMEOUT) -> str:
+    html = load_full_page(driver, url, timeout)
+    record_path(url, "browser")
+    return html
+
+
+def scrape_one(url: str, driver: webdriver.Chrome, timeout: float = URL_TIMEOUT) -> Dict[str, Any]:
+    html = fetch_static_page(url) or render_page(driver, url, timeout)
+    return parse_page(html, url)
+
+
+def parse_page(html: str, url: str, manifest: ChangeManifest | None = None) -> Dict[str, Any]:
+    soup = make_soup(html)
+    law_id = law_id_of(url)
+    name = text(TITLE_SEL.select_one(soup)) or url.split("/")[-1]
     metadata = extract_metadata(soup)
     status_law = metadata.get("حالة التشريع", "").strip()
-    container = soup.select_one("div.order-1") or soup
-    rules = [] if status_law == "ملغي" else build_structure(container)
+    container = CONTAINER_SEL.select_one(soup) or soup
+
+    prev = None
+    if manifest is not None:
+        digest = region_hash(container, status_law)
+        prev = manifest.reuse(law_id, digest)
+        manifest.update(law_id, digest)
+
+    if prev is not None:
+        rules = prev["rules"]
+    else:
+        rules = [] if status_law == "ملغي" else build_structure(container)
     return {
-        "law_id": url.rstrip("/").split("/")[-1],
+        "law_id": law_id,
         "name": name,
         "url": url,
         "metadata": metadata,
@@ -148,8 +235,117 @@ def scrape_one(url: str, driver: webdriver.Chrome) -> Dict[str, Any]:
     }
 
 
+def worker(
+    jobs: "queue.Queue[tuple[int, str, int] | None]",
+    sink: Callable[[int, Dict[str, Any]], None],
+    total: int,
+    timeout: float,
+    max_attempts: int,
+    manifest: ChangeManifest | None = None,
+) -> None:
+    driver: webdriver.Chrome | None = None     # started only if HTTP falls short
+    try:
+        while True:
+            job = jobs.get()
+            if job is None:
+                jobs.task_done()
+                break
+            idx, link, attempt = job
+            print(f"({idx}/{total}) {link}" + (f" [try {attempt}]" if attempt > 1 else ""))
+            try:
+                html = fetch_static_page(link)
+                if html is None:
+                    if driver is None:
+                        driver = init_driver()
+                    html = render_page(driver, link, timeout)
+                sink(idx, parse_page(html, link, manifest))
+            except (TimeoutException, WebDriverException) as exc:
+                if not isinstance(exc, TimeoutException) and driver is not None:
+                    # the browser may be wedged – the next load starts a fresh one
+                    try:
+                        driver.quit()
+                    except WebDriverException:
+                        pass
+                    driver = None
+                if attempt < max_attempts:
+                    print(f"  ↻ {type(exc).__name__} – re-queued {link}")
+                    jobs.put((idx, link, attempt + 1))
+                else:
+                    print(f"  ❌ {type(exc).__name__} after {attempt} tries – skipped {link}")
+            except Exception as exc:
+                print("  ❌", type(exc).__name__, exc)
+            finally:
+                jobs.task_done()
+    finally:
+        if driver is not None:
+            driver.quit()
+
+
+def scrape_all(
+    links: List[str],
+    workers: int = WORKERS,
+    timeout: float = URL_TIMEOUT,
+    max_attempts: int = MAX_ATTEMPTS,
+    manifest: ChangeManifest | None = None,
+    journal: Journal | None = None,
+) -> List[Dict[str, Any]]:
+    """Scrape *links* with *workers* browsers pulling from a shared queue.
+
+    With a *journal*, records are appended to it as they finish (links it
+    already holds are skipped) and the returned list is empty.
+    """
+    jobs: "queue.Queue[tuple[int, str, int] | None]" = queue.Queue()
+    for idx, link in enumerate(links, 1):
+        if journal is None or law_id_of(link) not in journal.done:
+            jobs.put((idx, link, 1))
+
+    results: Dict[int, Dict[str, Any]] = {}
+
+    def sink(idx: int, record: Dict[str, Any]) -> None:
+        if journal is None:
+            results[idx] = record
+        else:
+            journal.append(idx, record["law_id"], record)
+
+    threads = [
+        threading.Thread(
+            target=worker,
+            args=(jobs, sink, len(links), timeout, max_attempts, manifest),
+            daemon=True,
+        )
+        for _ in range(max(1, min(workers, len(links))))
+    ]
+    for t in threads:
+        t.start()
+
+    jobs.join()
+    for _ in threads:
+        jobs.put(None)
+    for t in threads:
+        t.join()
+
+    return [results[i] for i in sorted(results)]
+
+
 def main() -> None:
-    
+    ap = argparse.ArgumentParser(description="Scrape MOJ legislation")
+    ap.add_argument("--workers", type=int, default=WORKERS,
+                    help="browsers running in parallel")
+    ap.add_argument("--timeout", type=float, default=URL_TIMEOUT,
+                    help="seconds to wait for a page's sections")
+    ap.add_argument("--attempts", type=int, default=MAX_ATTEMPTS,
+                    help="loads per URL before giving up")
+    ap.add_argument("--http-first", action="store_true",
+                    help="try a plain GET first; accepted only when static_complete() holds")
+    ap.add_argument("--full", action="store_true",
+                    help="re-parse every law, ignoring the change manifest")
+    ap.add_argument("--resume", action="store_true",
+                    help="continue an interrupted run from its journal")
+    args = ap.parse_args()
+
+    global HTTP_FIRST
+    HTTP_FIRST = args.http_first
+
     path = pathlib.Path("data/raw_data/moj_laws.txt")
     if not path.exists():
         sys.exit(f"✖ File not found: {path}")
@@ -161,26 +357,21 @@ def main() -> None:
             url = line.split("#")[0].strip()
             links.append(url)
 
-    out: List[Dict[str, Any]] = []
-    driver = init_driver()
-
-    for idx, link in enumerate(links, 1):
-        print(f"({idx}/{len(links)}) {link}")
-        try:
-            out.append(scrape_one(link, driver))
-        except TimeoutException:
-            print("  ❌ Timeout while loading – skipped")
-        except Exception as exc:
-            print("  ❌", type(exc).__name__, exc)
-
-    driver.quit()
-
     out_dir = pathlib.Path("data")
     out_dir.mkdir(parents=True, exist_ok=True)
     out_path = out_dir / "scraped_data/moj_laws_detailed.json"
-    out_path.write_text(json.dumps(out, ensure_ascii=False, indent=2), "utf8")
+    manifest = ChangeManifest(out_path, records=[] if args.full else None,
+                               parser_version=PARSER_VERSION)
+    journal = Journal(out_path, resume=args.resume)
+
+    scrape_all(links, args.workers, args.timeout, args.attempts, manifest, journal)
+
+    count = journal.finalize()
+    manifest.save()
 
-    print("✅ Saved to", out_path.resolve())
+    print(f"✅ Saved {count} laws to", out_path.resolve())
+    print("🧮 Laws →", manifest.summary())
+    print("🌐 Fetch paths →", path_summary())
     print("🕒", datetime.now().isoformat(timespec="seconds"))
 
 if __name__ == "__main__":
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from typing import Callable, Dict
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from scrapers.html_parsing import compile_selector, make_soup
+from scrapers.http_cache import CACHE
+
+# Plain-HTTP fast path for the browser-based scrapers: when the server HTML
+# already contains the article containers there is no need to start Chrome.
+# One matching container does not prove the page is whole, so a scraper
+# whose pages load content lazily passes a *complete* check as well.
+
+SESSION = requests.Session()
+SESSION.headers.update(
+    {
+        "User-Agent": (
+            "Mozilla/5.0 (Macintosh; Apple Silicon) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125 Safari/537.36"
+        ),
+        "Accept-Language": "ar,en;q=0.8",
+    }
+)
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+FETCH_PATHS: Dict[str, str] = {}      # url → "http" | "browser"
+_paths_lock = threading.Lock()
+
+
+def record_path(url: str, path: str) -> None:
+    with _paths_lock:
+        FETCH_PATHS[url] = path
+
+
+def fetch_static(
+    url: str,
+    selector: str,
+    timeout: float = 20,
+    complete: Callable[[BeautifulSoup], bool] | None = None,
+) -> str | None:
+    """Return the server HTML of *url* if it already matches *selector*
+    and, when given, passes *complete*.
+
+    ``None`` means the caller has to render the page in a browser.
+    """
+    try:
+        r = CACHE.get(url, SESSION, timeout=timeout)
+        r.raise_for_status()
+    except requests.RequestException:
+        return None
+
+    soup = make_soup(r.text)
+    if compile_selector(selector).select_one(soup) is None:
+        return None
+    if complete is not None and not complete(soup):
+        return None
+
+    record_path(url, "http")
+    return r.text
+
+
+def path_summary() -> str:
+    with _paths_lock:
+        counts = Counter(FETCH_PATHS.values())
+    return f"http: {counts['http']}, browser: {counts['browser']}"
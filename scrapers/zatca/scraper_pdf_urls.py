@@ -1,8 +1,16 @@
 # scraper.py
-import requests
-from bs4 import BeautifulSoup
+import os
+import sys
+from bs4 import SoupStrainer
 from urllib.parse import urljoin
 
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from scrapers.html_parsing import make_soup
+from scrapers.http_cache import cached_get
+
 def extract_pdf_links():
     urls = []
     try:
@@ -11,9 +19,9 @@ def extract_pdf_links():
 
         for page_url in page_urls:
             print(f"\n جاري استخراج روابط PDF من: {page_url}")
-            response = requests.get(page_url, timeout=10)
+            response = cached_get(page_url, timeout=10)
             response.encoding = 'utf-8'
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = make_soup(response.text, only=SoupStrainer("a", href=True))
 
             for link in soup.find_all("a", href=True):
                 href = link["href"]
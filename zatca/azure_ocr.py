@@ -1,32 +1,111 @@
 # azure_ocr.py
 from azure.ai.formrecognizer import DocumentAnalysisClient
 from azure.core.credentials import AzureKeyCredential
+import hashlib
+import io
 import re
-import os
-import tempfile
-import requests
+import local_pdf
+from ocr_cache import OCR_CACHE, sha256_file
+from pdf_download import download_pdf
 
 ENDPOINT = "**********************************"
 KEY = "***************************************"
 
 client = DocumentAnalysisClient(endpoint=ENDPOINT, credential=AzureKeyCredential(KEY))
 
-def extract_text_from_pdf(file_path: str) -> list[str]:
-    with open(file_path, "rb") as f:
-        poller = client.begin_analyze_document("prebuilt-layout", document=f)
+USE_LOCAL_TEXT = True   # استخدام طبقة النص المضمنة قبل اللجوء إلى Azure
+
+
+def keep_line(text: str) -> bool:
+    if not text:
+        return False
+    if re.fullmatch(r"\d+", text):
+        return False
+    if re.search(r"(محتويات|فهرس|صفحة)", text):
+        return False
+    return True
+
+
+PdfSource = str | bytes  # مسار ملف أو محتوى PDF في الذاكرة
+
+
+def ocr_pdf_pages(source: PdfSource, pages: list[int] | None = None) -> dict[int, list[str]]:
+    """
+    يرسل الملف (أو صفحات محددة منه بدءاً من 1) إلى Azure ويعيد أسطر كل صفحة.
+    """
+    kwargs = {"pages": ",".join(map(str, pages))} if pages else {}
+    if isinstance(source, bytes):
+        poller = client.begin_analyze_document(
+            "prebuilt-layout", document=io.BytesIO(source), **kwargs
+        )
+    else:
+        with open(source, "rb") as f:
+            poller = client.begin_analyze_document("prebuilt-layout", document=f, **kwargs)
     result = poller.result()
 
+    return {
+        page.page_number: [line.content.strip() for line in page.lines]
+        for page in result.pages
+    }
+
+
+def cached_ocr_pages(source: PdfSource, pdf_hash: str, pages: list[int] | None = None) -> dict[int, list[str]]:
+    """
+    مثل ocr_pdf_pages لكن يعيد الصفحات المخزنة مسبقاً لنفس محتوى الملف
+    ولا يرسل إلى Azure إلا الصفحات الناقصة.
+    """
+    complete = pages is None
+    if complete:
+        pages = OCR_CACHE.document_pages(pdf_hash)
+
+    result: dict[int, list[str]] = {}
+    missing: list[int] | None = None
+    if pages is not None:
+        missing = []
+        for page in pages:
+            lines = OCR_CACHE.get_page(pdf_hash, page)
+            if lines is None:
+                missing.append(page)
+            else:
+                result[page] = lines
+
+    if missing is None or missing:
+        fresh = ocr_pdf_pages(source, missing)
+        if missing is None:
+            # لم يُستدع get_page لأن الملف غير معروف، فكل صفحاته تحسب كإخفاق
+            OCR_CACHE.record_misses(len(fresh))
+        OCR_CACHE.put_pages(pdf_hash, fresh, complete=complete and missing is None)
+        result.update(fresh)
+    return result
+
+
+def extract_text_from_pdf(source: PdfSource, pdf_hash: str | None = None) -> list[str]:
+    if pdf_hash is None:
+        pdf_hash = (
+            hashlib.sha256(source).hexdigest() if isinstance(source, bytes)
+            else sha256_file(source)
+        )
+    pages: dict[int, list[str]] = {}
+    scanned = None
+    if USE_LOCAL_TEXT and local_pdf.available():
+        try:
+            local_pages, scanned = local_pdf.extract_pdf_pages(source)
+            pages = {i: lines for i, lines in enumerate(local_pages, 1)}
+            print(f" 📄 {len(pages) - len(scanned)} صفحة نصية، {len(scanned)} صفحة ممسوحة ضوئياً")
+        except Exception as e:
+            print(f" تعذر الاستخراج المحلي، سيتم استخدام Azure: {e}")
+            pages, scanned = {}, None
+
+    # None: كل الملف إلى Azure، قائمة فارغة: لا حاجة لـ OCR
+    if scanned is None or scanned:
+        pages.update(cached_ocr_pages(source, pdf_hash, scanned))
+
     lines = []
-    for page in result.pages:
-        for line in page.lines:
-            text = line.content.strip()
-            if not text:
-                continue
-            if re.fullmatch(r"\d+", text):
-                continue
-            if re.search(r"(محتويات|فهرس|صفحة)", text):
-                continue
-            lines.append(text)
+    for page_number in sorted(pages):
+        for line in pages[page_number]:
+            text = line.strip()
+            if keep_line(text):
+                lines.append(text)
     return lines
 
 def remove_consecutive_fasl_lines(lines: list[str]) -> list[str]:
@@ -81,25 +160,16 @@ def process_pdf_url(pdf_url: str) -> str:
     ينزّل PDF من رابط، ويستخرج النص منه ويعيد النص القانوني المنسق.
     """
     try:
-        response = requests.get(pdf_url)
-        response.raise_for_status()
+        data, pdf_hash = download_pdf(pdf_url)
     except Exception as e:
         print(f" فشل تحميل الملف: {e}")
         return ""
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-        tmp_file.write(response.content)
-        tmp_path = tmp_file.name
-
     try:
-        lines = extract_text_from_pdf(tmp_path)
+        lines = extract_text_from_pdf(data, pdf_hash)
         cleaned_text=remove_consecutive_fasl_lines(lines)
         final_text = structure_legal_text(cleaned_text)
         return final_text
     except Exception as e:
         print(f" فشل استخراج النص: {e}")
         return ""
-    finally:
-        if os.path.exists(tmp_path):
-            os.remove(tmp_path)
-
@@ -1,8 +1,31 @@
 # openai_json_converter.py
+import json
 import os
-from openai import OpenAI
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from openai import OpenAI, APIConnectionError, APIStatusError, RateLimitError
+from llm_cache import LLM_CACHE, prompt_fingerprint
 
-client = OpenAI(api_key="*****************************************")
+# OPENAI_BASE_URL يسمح بتوجيه الطلبات إلى خادم تجريبي محلي
+client = OpenAI(
+    api_key="*****************************************",
+    base_url=os.environ.get("OPENAI_BASE_URL"),
+    max_retries=0,  # إعادة المحاولة تتم هنا مع مراعاة حدود المعدل
+)
+
+MODEL = "gpt-4o-mini"
+TEMPERATURE = 0.2
+LLM_WORKERS = 4         # عدد الفصول التي تُرسل للمودل في نفس الوقت
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0      # ثوانٍ
+BACKOFF_MAX = 60.0
+USE_CACHE = True
+
+# عند تجاوز حد المعدل تتوقف جميع الخيوط حتى هذا الوقت
+_cooldown_until = 0.0
+_cooldown_lock = threading.Lock()
 
 system_prompt = """
 أنت مساعد قانوني ذكي. 
@@ -42,19 +65,106 @@ system_prompt = """
 
 """.strip()
 
-def convert_text_to_json_structure(text):
+PROMPT_FINGERPRINT = prompt_fingerprint(system_prompt, MODEL, TEMPERATURE)
+
+
+def clean_code_block_markers(text: str) -> str:
+    """
+    تنظف ```json و ``` من النص لو موجودة
+    """
+    text = text.strip()
+    if text.startswith("```json"):
+        text = text[len("```json"):].strip()
+    if text.endswith("```"):
+        text = text[:-3].strip()
+    return text
+
+
+def is_valid_json(text):
+    try:
+        json.loads(clean_code_block_markers(text))
+        return True
+    except json.JSONDecodeError:
+        return False
+
+
+def _retry_delay(error, attempt):
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": text}  
-            ],
-            temperature=0.2
-        )
-        print(response.choices[0].message.content)
-        return response.choices[0].message.content
-    except Exception as e:
-        print(f" فشل تحويل النص إلى JSON: {e}")
-        return ""
+        delay = float(retry_after)
+    except (TypeError, ValueError):
+        delay = BACKOFF_BASE * 2 ** attempt
+    return min(delay, BACKOFF_MAX) + random.uniform(0, 0.5)
+
+
+def _wait_for_cooldown():
+    while True:
+        with _cooldown_lock:
+            remaining = _cooldown_until - time.monotonic()
+        if remaining <= 0:
+            return
+        time.sleep(remaining)
+
+
+def _start_cooldown(delay):
+    global _cooldown_until
+    with _cooldown_lock:
+        _cooldown_until = max(_cooldown_until, time.monotonic() + delay)
+
+
+def _is_retryable(error):
+    if isinstance(error, (RateLimitError, APIConnectionError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
+def convert_text_to_json_structure(text):
+    if USE_CACHE:
+        cached = LLM_CACHE.get(PROMPT_FINGERPRINT, text)
+        if cached is not None:
+            return cached
+
+    content = _request_completion(text)
+    if USE_CACHE and content and is_valid_json(content):
+        LLM_CACHE.put(PROMPT_FINGERPRINT, text, content)
+    return content
+
+
+def _request_completion(text):
+    for attempt in range(MAX_RETRIES + 1):
+        _wait_for_cooldown()
+        try:
+            response = client.chat.completions.create(
+                model=MODEL,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": text}  
+                ],
+                temperature=TEMPERATURE
+            )
+            print(response.choices[0].message.content)
+            return response.choices[0].message.content
+        except Exception as e:
+            if attempt < MAX_RETRIES and _is_retryable(e):
+                delay = _retry_delay(e, attempt)
+                print(f" ⏳ {type(e).__name__}، إعادة المحاولة بعد {delay:.1f} ثانية")
+                if isinstance(e, RateLimitError):
+                    _start_cooldown(delay)
+                else:
+                    time.sleep(delay)
+                continue
+            print(f" فشل تحويل النص إلى JSON: {e}")
+            return ""
+    return ""
+
+
+def convert_chunks(chunks, workers=LLM_WORKERS):
+    """
+    تحول عدة فصول بالتوازي وتعيد الردود بنفس ترتيب الفصول.
+    """
+    if workers <= 1 or len(chunks) <= 1:
+        return [convert_text_to_json_structure(chunk) for chunk in chunks]
+    with ThreadPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        return list(pool.map(convert_text_to_json_structure, chunks))
 
@@ -0,0 +1,97 @@
+# llm_cache.py
+import hashlib
+import json
+import os
+import pathlib
+import threading
+
+CACHE_DIR = pathlib.Path(os.environ.get("ZATCA_LLM_CACHE", "data/.llm_cache"))
+MAX_BYTES = 128 * 1024 * 1024
+
+
+def prompt_fingerprint(system_prompt, model, temperature):
+    return hashlib.sha256(
+        json.dumps([system_prompt, model, temperature], ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+
+
+class LlmCache:
+    """
+    ذاكرة دائمة لردود المودل، مفتاحها بصمة (التعليمات، المودل، درجة الحرارة، نص الفصل).
+    لا تخزن إلا ردوداً صالحة كـ JSON، وتحذف الأقدم استخداماً عند تجاوز الحجم الأقصى.
+    """
+
+    def __init__(self, root=CACHE_DIR, max_bytes=MAX_BYTES):
+        self.root = pathlib.Path(root)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def key(self, fingerprint, text):
+        return hashlib.sha256(f"{fingerprint}\0{text}".encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, fingerprint, text):
+        path = self._path(self.key(fingerprint, text))
+        try:
+            entry = json.loads(path.read_text("utf-8"))
+            os.utime(path)
+        except (OSError, ValueError):
+            entry = None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry["response"] if entry is not None else None
+
+    def put(self, fingerprint, text, response):
+        path = self._path(self.key(fingerprint, text))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"prompt": fingerprint, "response": response}, ensure_ascii=False),
+            "utf-8",
+        )
+        os.replace(tmp, path)
+        self.evict()
+
+    def invalidate(self, keep_fingerprint=None):
+        """
+        يحذف الردود المخزنة لتعليمات أخرى غير keep_fingerprint (أو كل شيء).
+        """
+        removed = 0
+        for path in self.root.glob("*/*.json"):
+            try:
+                entry = json.loads(path.read_text("utf-8"))
+            except (OSError, ValueError):
+                entry = {}
+            if keep_fingerprint is None or entry.get("prompt") != keep_fingerprint:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def evict(self):
+        files = []
+        for path in self.root.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def summary(self):
+        return f"LLM cache – hits: {self.hits}, misses: {self.misses}"
+
+
+LLM_CACHE = LlmCache()
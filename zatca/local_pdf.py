@@ -0,0 +1,169 @@
+# local_pdf.py
+import io
+import multiprocessing
+import os
+import re
+import threading
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LAParams, LTChar, LTTextContainer, LTTextLine
+    from pdfminer.pdfpage import PDFPage
+except ImportError:  # pdfminer.six غير مثبت: كل الصفحات تذهب إلى Azure
+    extract_pages = None
+
+MIN_PAGE_CHARS = 20      # أقل من ذلك تعتبر الصفحة ممسوحة ضوئياً وتحتاج OCR
+PDF_WORKERS = os.cpu_count() or 2
+
+ARABIC_RE = re.compile(r"[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF]")
+ARABIC_LETTER_RE = re.compile(r"[\u0621-\u064A\u0671-\u06D3\uFB50-\uFDFF\uFE70-\uFEFC]")
+LTR_RE = re.compile(r"[A-Za-z0-9\u0660-\u0669\u06F0-\u06F9]")
+
+
+def available():
+    return extract_pages is not None
+
+
+def _open(source):
+    """source مسار ملف أو محتوى PDF في الذاكرة (bytes)."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    return open(source, "rb")
+
+
+def page_count(source):
+    with _open(source) as f:
+        return sum(1 for _ in PDFPage.get_pages(f))
+
+
+def _iter_text_lines(layout):
+    for element in layout:
+        if isinstance(element, LTTextLine):
+            yield element
+        elif isinstance(element, LTTextContainer):
+            yield from _iter_text_lines(element)
+
+
+def _is_ltr(token):
+    return bool(LTR_RE.search(token)) and not ARABIC_LETTER_RE.search(token)
+
+
+def _reverse_ltr_runs(items, is_ltr):
+    out, run = [], []
+    for item in items:
+        if is_ltr(item):
+            run.append(item)
+            continue
+        out.extend(reversed(run))
+        run = []
+        out.append(item)
+    out.extend(reversed(run))
+    return out
+
+
+def _logical_line(line):
+    """
+    يعيد نص السطر بالترتيب المنطقي: الحروف العربية من اليمين إلى اليسار
+    مع الإبقاء على الأرقام والكلمات اللاتينية من اليسار إلى اليمين.
+    """
+    chars = [c for c in line if isinstance(c, LTChar)]
+    if not ARABIC_RE.search("".join(c.get_text() for c in chars)):
+        return unicodedata.normalize("NFKC", line.get_text()).strip()
+
+    # نقرأ الحروف من اليمين، ونقسمها إلى كلمات حسب الفجوات بينها
+    chars.sort(key=lambda c: -c.x1)
+    words, current, prev = [], [], None
+    for c in chars:
+        t = c.get_text()
+        gap = prev is not None and prev.x0 - c.x1 > 0.25 * max(c.size, 1)
+        if t.isspace() or gap:
+            if current:
+                words.append(current)
+            current = []
+        if not t.isspace():
+            current.append(t)
+        prev = c
+    if current:
+        words.append(current)
+
+    # الأرقام واللاتينية داخل الكلمة وبين الكلمات تعود لاتجاهها الأصلي
+    tokens = ["".join(_reverse_ltr_runs(w, lambda t: LTR_RE.fullmatch(t) is not None)) for w in words]
+    tokens = _reverse_ltr_runs(tokens, _is_ltr)
+    return unicodedata.normalize("NFKC", " ".join(tokens)).strip()
+
+
+def extract_page_lines(source, page_index):
+    """
+    يستخرج أسطر صفحة واحدة (تبدأ من 0) من طبقة النص المضمنة.
+    """
+    lines = []
+    with _open(source) as f:
+        for layout in extract_pages(f, page_numbers=[page_index], laparams=LAParams()):
+            text_lines = sorted(_iter_text_lines(layout), key=lambda l: (-round(l.y1), -l.x1))
+            for line in text_lines:
+                text = _logical_line(line)
+                if text:
+                    lines.append(text)
+    return lines
+
+
+def has_text_layer(lines):
+    return sum(len(line) for line in lines) >= MIN_PAGE_CHARS
+
+
+def _safe_extract(source, page_index):
+    try:
+        return extract_page_lines(source, page_index)
+    except Exception:
+        return []
+
+
+def _extract_batch(source, page_indices):
+    return [_safe_extract(source, i) for i in page_indices]
+
+
+# مجمع عمليات واحد مشترك بين كل خيوط مرحلة OCR، بدلاً من مجمع لكل ملف.
+# ينشأ من خيط عامل بينما خيوط التنزيل والنموذج تعمل، لذلك تبدأ العمليات بـ spawn:
+# fork ينسخ العملية بأقفال تمسكها تلك الخيوط (requests، الكاش، الطوابير)
+_pool = None
+_pool_lock = threading.Lock()
+_mp_context = multiprocessing.get_context("spawn")
+
+
+def shared_pool(workers=PDF_WORKERS):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=_mp_context)
+        return _pool
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+def extract_pdf_pages(source, workers=PDF_WORKERS):
+    """
+    يستخرج نص كل صفحة بالتوازي على مجمع العمليات المشترك.
+    يعيد (أسطر كل صفحة، أرقام الصفحات الممسوحة ضوئياً بدءاً من 1).
+    """
+    n = page_count(source)
+    if workers <= 1 or n <= 1:
+        pages = _extract_batch(source, range(n))
+    else:
+        # المصدر يرسل مرة واحدة لكل دفعة، والصفحات موزعة بالتناوب لموازنة الحمل
+        k = min(workers, n)
+        batches = [list(range(i, n, k)) for i in range(k)]
+        results = shared_pool(workers).map(_extract_batch, [source] * k, batches)
+        pages = [None] * n
+        for batch, lines in zip(batches, results):
+            for i, page_lines in zip(batch, lines):
+                pages[i] = page_lines
+    scanned = [i + 1 for i, lines in enumerate(pages) if not has_text_layer(lines)]
+    return pages, scanned
@@ -0,0 +1,110 @@
+# ocr_cache.py
+import hashlib
+import json
+import os
+import pathlib
+import threading
+
+CACHE_DIR = pathlib.Path(os.environ.get("ZATCA_OCR_CACHE", "data/.ocr_cache"))
+MAX_BYTES = 256 * 1024 * 1024
+
+
+def sha256_file(file_path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class OcrCache:
+    """
+    ذاكرة دائمة لنتائج Azure لكل صفحة، مفتاحها SHA-256 لمحتوى ملف PDF ورقم الصفحة.
+    تحذف الإدخالات الأقدم استخداماً (حسب وقت التعديل) عند تجاوز الحجم الأقصى.
+    """
+
+    def __init__(self, root=CACHE_DIR, max_bytes=MAX_BYTES):
+        self.root = pathlib.Path(root)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _page_path(self, pdf_hash, page):
+        return self.root / pdf_hash[:2] / f"{pdf_hash}.p{page}.json"
+
+    def _doc_path(self, pdf_hash):
+        return self.root / pdf_hash[:2] / f"{pdf_hash}.pages.json"
+
+    def _read(self, path):
+        try:
+            data = json.loads(path.read_text("utf-8"))
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)  # تحديث وقت الاستخدام لسياسة LRU
+        except OSError:
+            pass
+        return data
+
+    def _write(self, path, data):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False), "utf-8")
+        os.replace(tmp, path)
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def record_misses(self, n):
+        with self._lock:
+            self.misses += n
+
+    def get_page(self, pdf_hash, page):
+        data = self._read(self._page_path(pdf_hash, page))
+        self._count(data is not None)
+        return data["lines"] if data is not None else None
+
+    def put_page(self, pdf_hash, page, lines):
+        self._write(self._page_path(pdf_hash, page), {"lines": lines})
+
+    def document_pages(self, pdf_hash):
+        """أرقام صفحات ملف تمت معالجته كاملاً من قبل، أو None."""
+        data = self._read(self._doc_path(pdf_hash))
+        return data["pages"] if data is not None else None
+
+    def put_pages(self, pdf_hash, pages, complete=False):
+        """
+        يخزن أسطر عدة صفحات؛ complete تعني أن هذه كل صفحات الملف.
+        """
+        for page, lines in pages.items():
+            self.put_page(pdf_hash, page, lines)
+        if complete:
+            self._write(self._doc_path(pdf_hash), {"pages": sorted(pages)})
+        self.evict()
+
+    def evict(self):
+        files = []
+        for path in self.root.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def summary(self):
+        return f"OCR cache – hits: {self.hits}, misses: {self.misses}"
+
+
+OCR_CACHE = OcrCache()
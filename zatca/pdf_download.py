@@ -0,0 +1,51 @@
+# pdf_download.py
+import hashlib
+import io
+
+import requests
+
+CHUNK_SIZE = 256 * 1024
+MAX_ATTEMPTS = 4
+TIMEOUT = 30
+
+
+def download_pdf(pdf_url, session=None, max_attempts=MAX_ATTEMPTS, chunk_size=CHUNK_SIZE):
+    """
+    ينزّل ملف PDF على دفعات إلى الذاكرة ويحسب SHA-256 أثناء التنزيل.
+    إذا انقطع الاتصال يكمل من حيث توقف عبر ترويسة Range عندما يدعمها الخادم.
+    يعيد (محتوى الملف، البصمة).
+    """
+    http = session or requests
+    buffer = io.BytesIO()
+    hasher = hashlib.sha256()
+    expected = None
+
+    for attempt in range(1, max_attempts + 1):
+        received = buffer.tell()
+        headers = {"Range": f"bytes={received}-"} if received else {}
+        try:
+            with http.get(pdf_url, headers=headers, stream=True, timeout=TIMEOUT) as response:
+                response.raise_for_status()
+                if received and response.status_code != 206:
+                    # الخادم لا يدعم الاستكمال: نبدأ من جديد
+                    buffer = io.BytesIO()
+                    hasher = hashlib.sha256()
+                    received = 0
+                if expected is None or response.status_code == 200:
+                    length = response.headers.get("Content-Length")
+                    expected = received + int(length) if length else None
+
+                for chunk in response.iter_content(chunk_size):
+                    buffer.write(chunk)
+                    hasher.update(chunk)
+
+            if expected is None or buffer.tell() >= expected:
+                return buffer.getvalue(), hasher.hexdigest()
+            raise requests.ConnectionError(
+                f"incomplete body: {buffer.tell()} of {expected} bytes"
+            )
+        except (requests.ConnectionError, requests.Timeout,
+                requests.exceptions.ChunkedEncodingError) as e:
+            if attempt == max_attempts:
+                raise
+            print(f" ↻ انقطع التنزيل عند {buffer.tell()} بايت، استكمال ({e})")
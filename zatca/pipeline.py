@@ -0,0 +1,134 @@
+# pipeline.py
+import queue
+import threading
+import time
+
+_DONE = object()   # علامة نهاية التدفق بين المراحل
+
+
+class Stage:
+    """
+    مرحلة في خط المعالجة: عدد من الخيوط يقرأ من طابور محدود الحجم،
+    ويطبق fn على كل عنصر، ويمرر النتيجة إلى طابور المرحلة التالية.
+    إذا أعادت fn القيمة None أو رفعت استثناءً يُسقط العنصر.
+    """
+
+    def __init__(self, name, fn, workers=1, maxsize=4):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.inbox = queue.Queue(maxsize=maxsize)
+        self.downstream = None
+        self.processed = 0
+        self.failed = 0
+        self.busy = 0.0
+        self.depth_samples = 0
+        self.depth_total = 0
+        self.depth_max = 0
+        self._alive = self.workers
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def _sample_depth(self):
+        depth = self.inbox.qsize()
+        with self._lock:
+            self.depth_samples += 1
+            self.depth_total += depth
+            self.depth_max = max(self.depth_max, depth)
+
+    def _run(self):
+        while True:
+            self._sample_depth()
+            item = self.inbox.get()
+            if item is _DONE:
+                break
+            start = time.monotonic()
+            try:
+                result = self.fn(item)
+                ok = True
+            except Exception as e:
+                print(f" ❌ [{self.name}] {type(e).__name__}: {e}")
+                result, ok = None, False
+            with self._lock:
+                self.busy += time.monotonic() - start
+                if ok:
+                    self.processed += 1
+                else:
+                    self.failed += 1
+            if result is not None:
+                self.downstream.put(result)
+
+        with self._lock:
+            self._alive -= 1
+            last = self._alive == 0
+        if last:
+            self.downstream.close()
+
+    def put(self, item):
+        self.inbox.put(item)
+
+    def close(self):
+        for _ in range(self.workers):
+            self.inbox.put(_DONE)
+
+    def start(self):
+        for i in range(self.workers):
+            t = threading.Thread(target=self._run, name=f"{self.name}-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+
+class _Sink:
+    def __init__(self, maxsize):
+        self.inbox = queue.Queue(maxsize=maxsize)
+
+    def put(self, item):
+        self.inbox.put(item)
+
+    def close(self):
+        self.inbox.put(_DONE)
+
+
+class Pipeline:
+    def __init__(self, stages, maxsize=4):
+        self.stages = stages
+        self.sink = _Sink(maxsize)
+        for stage, nxt in zip(stages, stages[1:] + [self.sink]):
+            stage.downstream = nxt
+        self.started = None
+        self.elapsed = 0.0
+
+    def run(self, items):
+        """
+        يغذي العناصر في المرحلة الأولى ويعيد نتائج المرحلة الأخيرة فور جاهزيتها.
+        """
+        self.started = time.monotonic()
+        for stage in self.stages:
+            stage.start()
+
+        def feed():
+            for item in items:
+                self.stages[0].put(item)
+            self.stages[0].close()
+
+        threading.Thread(target=feed, name="feeder", daemon=True).start()
+
+        while True:
+            item = self.sink.inbox.get()
+            if item is _DONE:
+                break
+            yield item
+        self.elapsed = time.monotonic() - self.started
+
+    def report(self):
+        elapsed = self.elapsed or (time.monotonic() - (self.started or time.monotonic()))
+        lines = [f" {'stage':<10}{'workers':>8}{'done':>6}{'failed':>7}"
+                 f"{'items/min':>11}{'busy %':>8}{'queue avg':>10}{'queue max':>10}"]
+        for s in self.stages:
+            rate = s.processed / elapsed * 60 if elapsed else 0.0
+            busy = s.busy / (elapsed * s.workers) * 100 if elapsed else 0.0
+            avg = s.depth_total / s.depth_samples if s.depth_samples else 0.0
+            lines.append(f" {s.name:<10}{s.workers:>8}{s.processed:>6}{s.failed:>7}"
+                         f"{rate:>11.1f}{busy:>8.0f}{avg:>10.1f}{s.depth_max:>10}")
+        lines.append(f" total {elapsed:.1f}s")
+        return "\n".join(lines)
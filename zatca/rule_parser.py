@@ -0,0 +1,71 @@
+# rule_parser.py
+import os
+import sys
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from scrapers.arabic_text import article_number
+
+# محلل قواعدي يحول فصلاً ناتجاً عن structure_legal_text مباشرة إلى
+# {"chapters": [{"chapter_title", "articles": [{"title", "content"}]}]}
+# ويعيد None عندما لا يكون واثقاً من النتيجة ليتم اللجوء إلى المودل.
+
+MAX_CHAPTER_TITLE = 120   # أطول من ذلك يعني أن تحت عنوان الفصل نصاً غير مهيكل
+
+
+def _chapter_title(header, rest):
+    if not rest:
+        return header
+    if ":" in header or "\n" in rest or len(rest) > MAX_CHAPTER_TITLE:
+        return None
+    return f"{header}: {rest}"
+
+
+def parse_chunk(chunk):
+    """
+    يعيد (النتيجة، أرقام المواد) أو (None, []) إذا فشل فحص الثقة.
+    """
+    blocks = [b.strip() for b in chunk.split("\n\n") if b.strip()]
+    if not blocks or not blocks[0].startswith("الفصل"):
+        return None, []
+
+    header, _, rest = blocks[0].partition("\n")
+    title = _chapter_title(header.strip(), rest.strip())
+    if title is None or len(blocks) < 2:
+        return None, []
+
+    articles, numbers = [], []
+    for block in blocks[1:]:
+        head, _, content = block.partition("\n")
+        head, content = head.strip(), content.strip()
+        if not head.startswith("المادة") or not content:
+            return None, []
+        number = article_number(head)
+        if number is None:
+            return None, []
+        numbers.append(number)
+        articles.append({"title": head, "content": content})
+
+    # يجب أن تكون أرقام المواد متتالية بلا فجوات أو تكرار
+    if any(b != a + 1 for a, b in zip(numbers, numbers[1:])):
+        return None, []
+
+    return {"chapters": [{"chapter_title": title, "articles": articles}]}, numbers
+
+
+def parse_chunks(chunks):
+    """
+    يحلل كل الفصول ويعيد قائمة بنفس الطول، فيها None لكل فصل يحتاج المودل.
+    يتحقق أيضاً من أن أول مادة في كل فصل تلي آخر مادة في الفصل السابق.
+    """
+    results = []
+    last = None
+    for chunk in chunks:
+        parsed, numbers = parse_chunk(chunk)
+        if parsed is not None and last is not None and numbers[0] != last + 1:
+            parsed = None
+        results.append(parsed)
+        last = numbers[-1] if numbers else None
+    return results
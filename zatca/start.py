@@ -1,92 +1,175 @@
+import argparse
 import json
 import os
 import sys
-from azure_ocr import process_pdf_url
-from json_converter import convert_text_to_json_structure  
+from azure_ocr import extract_text_from_pdf, remove_consecutive_fasl_lines, structure_legal_text
+import local_pdf
+from ocr_cache import OCR_CACHE
+import json_converter
+from json_converter import LLM_WORKERS, clean_code_block_markers, convert_chunks
+from llm_cache import LLM_CACHE
+from pdf_download import download_pdf
+from pipeline import Pipeline, Stage
+from rule_parser import parse_chunks
 
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+from scrapers.journal import Journal
 from scrapers.zatca.scraper_pdf_urls import extract_pdf_links
 
 
 
 
-def clean_code_block_markers(text: str) -> str:
+def split_text_by_chapter(text: str) -> list[str]:
     """
-    تنظف ```json و ``` من النص لو موجودة
+    تقسم النص إلى دفعات بناءً على 3 أسطر فارغة، كل دفعة تمثل فصل مستقل.
     """
-    text = text.strip()
-    if text.startswith("```json"):
-        text = text[len("```json"):].strip()
-    if text.endswith("```"):
-        text = text[:-3].strip()
-    return text
+    return [chunk.strip() for chunk in text.split("\n\n\n") if chunk.strip()]
 
 
-def split_text_by_chapter(text: str) -> list[str]:
+def assemble_law(page_url: str, responses: list[str]) -> dict:
     """
-    تقسم النص إلى دفعات بناءً على 3 أسطر فارغة، كل دفعة تمثل فصل مستقل.
+    تجمع ردود المودل لكل فصل (بترتيب الفصول) في قانون واحد.
     """
-    return [chunk.strip() for chunk in text.split("\n\n\n") if chunk.strip()]
+    combined_law = {
+        "name": None,
+        "url": page_url,   
+        "metadata": {},
+        "chapters": []
+    }
+
+    for part_num, response in enumerate(responses, 1):
+        if not response.strip():
+            print(" لم يتم توليد JSON لهذا الفصل.")
+            continue
 
+        cleaned = clean_code_block_markers(response)
+
+        try:
+            parsed = json.loads(cleaned)
+            if part_num == 1:
+                combined_law["name"] = parsed.get("name", "")
+                combined_law["metadata"] = parsed.get("metadata", {})
+            combined_law["chapters"].extend(parsed.get("chapters", []))
+            print(f" تم تحليل الفصل {part_num}")
+        except json.JSONDecodeError as e:
+            print(f"خطأ في تحويل JSON للفصل {part_num}: {e}")
+            continue
 
-def main():
-    url_pairs = extract_pdf_links()  
-    output_file = "data\zatca_data.json"
-    all_laws = []
+    return combined_law
 
-    for idx, (page_url, pdf_url) in enumerate(url_pairs, 1):
-        print(f"\n [{idx}] معالجة صفحة: {page_url}")
-        print(f"   معالجة ملف PDF: {pdf_url}")
 
-        extracted_text = process_pdf_url(pdf_url)
-        if not extracted_text.strip():
-            print(" لا يوجد نص مستخرج.")
-            continue
+# مراحل خط المعالجة؛ كل مرحلة تستقبل قاموس الملف وتضيف إليه ناتجها
 
-        chunks = split_text_by_chapter(extracted_text)
-        if not chunks:
-            print(" لم يتم العثور على فصول.")
-            continue
+def download_stage(item: dict) -> dict:
+    print(f"\n [{item['idx']}] معالجة صفحة: {item['page_url']}")
+    print(f"   معالجة ملف PDF: {item['pdf_url']}")
+    item["data"], item["pdf_hash"] = download_pdf(item["pdf_url"])
+    return item
 
-        combined_law = {
-            "name": None,
-            "url": page_url,   
-            "metadata": {},
-            "chapters": []
-        }
-
-        for part_num, chunk in enumerate(chunks, 1):
-            print(f" إرسال الفصل {part_num} للمودل...")
-            response = convert_text_to_json_structure(chunk)
-            if not response.strip():
-                print(" لم يتم توليد JSON لهذا الفصل.")
-                continue
-
-            cleaned = clean_code_block_markers(response)
-
-            try:
-                parsed = json.loads(cleaned)
-                if part_num == 1:
-                    combined_law["name"] = parsed.get("name", "")
-                    combined_law["metadata"] = parsed.get("metadata", {})
-                combined_law["chapters"].extend(parsed.get("chapters", []))
-                print(f" تم تحليل الفصل {part_num}")
-            except json.JSONDecodeError as e:
-                print(f"خطأ في تحويل JSON للفصل {part_num}: {e}")
-                continue
-
-        if combined_law["chapters"]:
-            all_laws.append(combined_law)
-            print(f" تم تجميع القانون رقم {idx} بنجاح.")
-
-
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump({"laws": all_laws}, f, ensure_ascii=False, indent=2)
-
-    print(f"\n تم حفظ كل القوانين في {output_file}")
+
+def ocr_stage(item: dict) -> dict:
+    item["lines"] = extract_text_from_pdf(item.pop("data"), item["pdf_hash"])
+    return item
+
+
+def structure_stage(item: dict) -> dict | None:
+    text = structure_legal_text(remove_consecutive_fasl_lines(item.pop("lines")))
+    if not text.strip():
+        print(f" [{item['idx']}] لا يوجد نص مستخرج.")
+        return None
+    item["chunks"] = split_text_by_chapter(text)
+    if not item["chunks"]:
+        print(f" [{item['idx']}] لم يتم العثور على فصول.")
+        return None
+    return item
+
+
+def make_convert_stage(llm_workers: int, use_rules: bool = True, offline: bool = False):
+    """
+    يحلل الفصول المهيكلة محلياً، ولا يرسل للمودل إلا ما فشل فيه فحص الثقة.
+    الفصل الأول يذهب للمودل دائماً لاستخراج الاسم والبيانات الوصفية، إلا في وضع offline.
+    """
+    def convert_stage(item: dict) -> dict:
+        chunks = item.pop("chunks")
+        parsed = parse_chunks(chunks) if use_rules or offline else [None] * len(chunks)
+        if not offline:
+            parsed[0] = None
+        pending = [chunk for chunk, p in zip(chunks, parsed) if p is None]
+
+        print(f" [{item['idx']}] {len(chunks) - len(pending)} فصول بالقواعد، "
+              f"{len(pending)} {'متروكة (offline)' if offline else 'للمودل'}")
+        llm = iter([""] * len(pending) if offline else convert_chunks(pending, llm_workers))
+        responses = [
+            next(llm) if p is None else json.dumps(p, ensure_ascii=False)
+            for p in parsed
+        ]
+        item["law"] = assemble_law(item["page_url"], responses)
+        return item
+    return convert_stage
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ZATCA PDF → JSON pipeline")
+    parser.add_argument("--resume", action="store_true",
+                        help="تخطي ملفات PDF التي تمت معالجتها في تشغيل سابق")
+    parser.add_argument("--llm-workers", type=int, default=LLM_WORKERS,
+                        help="عدد الفصول المرسلة للمودل في نفس الوقت")
+    parser.add_argument("--no-llm-cache", action="store_true",
+                        help="إرسال كل الفصول للمودل حتى لو كانت ردودها مخزنة")
+    parser.add_argument("--prune-llm-cache", action="store_true",
+                        help="حذف الردود المخزنة لتعليمات أو مودل سابق")
+    parser.add_argument("--no-rules", action="store_true",
+                        help="إرسال كل الفصول للمودل بدون المحلل القواعدي")
+    parser.add_argument("--offline", action="store_true",
+                        help="عدم استخدام المودل إطلاقاً؛ الفصول التي لا تحللها القواعد تُترك")
+    parser.add_argument("--download-workers", type=int, default=3)
+    parser.add_argument("--ocr-workers", type=int, default=2,
+                        help="ملفات تعالج في نفس الوقت؛ كلها تتشارك مجمع عمليات واحد لاستخراج النص")
+    parser.add_argument("--structure-workers", type=int, default=1)
+    parser.add_argument("--convert-workers", type=int, default=2,
+                        help="عدد ملفات PDF التي تحول بالمودل في نفس الوقت")
+    parser.add_argument("--queue-size", type=int, default=2,
+                        help="الحد الأقصى للعناصر المنتظرة بين كل مرحلتين")
+    args = parser.parse_args()
+
+    json_converter.USE_CACHE = not args.no_llm_cache
+    if args.prune_llm_cache:
+        removed = LLM_CACHE.invalidate(keep_fingerprint=json_converter.PROMPT_FINGERPRINT)
+        print(f" تم حذف {removed} رداً مخزناً لتعليمات سابقة")
+
+    url_pairs = extract_pdf_links()  
+    output_file = "data\zatca_data.json"
+    journal = Journal(output_file, resume=args.resume)
+
+    items = (
+        {"idx": idx, "page_url": page_url, "pdf_url": pdf_url}
+        for idx, (page_url, pdf_url) in enumerate(url_pairs, 1)
+        if pdf_url not in journal.done
+    )
+    pipeline = Pipeline([
+        Stage("download", download_stage, args.download_workers, args.queue_size),
+        Stage("ocr", ocr_stage, args.ocr_workers, args.queue_size),
+        Stage("structure", structure_stage, args.structure_workers, args.queue_size),
+        Stage("convert", make_convert_stage(args.llm_workers, not args.no_rules, args.offline), args.convert_workers, args.queue_size),
+    ], maxsize=args.queue_size)
+
+    try:
+        for item in pipeline.run(items):
+            if item["law"]["chapters"]:
+                journal.append(item["idx"], item["pdf_url"], item["law"])
+                print(f" تم تجميع القانون رقم {item['idx']} بنجاح.")
+    finally:
+        local_pdf.shutdown_pool()
+
+    count = journal.finalize(wrap_key="laws")
+
+    print(f"\n تم حفظ كل القوانين ({count}) في {output_file}")
+    print(f" {OCR_CACHE.summary()}")
+    print(f" {LLM_CACHE.summary()}")
+    print(pipeline.report())
 
 
 if __name__ == "__main__":